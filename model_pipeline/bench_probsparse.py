@@ -0,0 +1,102 @@
+"""Memory/throughput benchmark: gather-based vs. expand-based ProbSparse sampling.
+
+Every configuration runs in a fresh process so the peak RSS of one run does
+not hide another's. Example:
+
+    python -m model_pipeline.bench_probsparse --seq-lens 5 48 192 768 --batch-sizes 32 256
+"""
+import argparse
+import multiprocessing as mp
+import time
+import torch
+
+from model_pipeline.models.informer import ProbSparseAttention
+from model_pipeline.training import peak_rss_mb
+
+
+class ExpandProbSparseAttention(ProbSparseAttention):
+    """The previous notebook version, which indexes an expanded (B, H, L_Q, L_K, E) view of K."""
+
+    def _prob_QK(self, Q, K, sample_k, n_top):
+        B, H, L_K, E = K.shape
+        _, _, L_Q, _ = Q.shape
+        K_expand = K.unsqueeze(-3).expand(B, H, L_Q, L_K, E)
+        index_sample = torch.randint(L_K, (L_Q, sample_k))
+        K_sample = K_expand[:, :, torch.arange(L_Q).unsqueeze(1), index_sample, :]
+        Q_K_sample = torch.matmul(Q.unsqueeze(-2), K_sample.transpose(-2, -1)).squeeze(-2)
+        M = Q_K_sample.max(-1)[0] - torch.div(Q_K_sample.sum(-1), L_K)
+        M_top = M.topk(n_top, sorted=False)[1]
+        Q_reduce = Q[torch.arange(B)[:, None, None],
+                     torch.arange(H)[None, :, None],
+                     M_top, :]
+        Q_K = torch.matmul(Q_reduce, K.transpose(-2, -1))
+        return Q_K, M_top
+
+
+IMPLEMENTATIONS = {"expand": ExpandProbSparseAttention, "gather": ProbSparseAttention}
+
+
+def run_case(impl, seq_len, batch_size, d_model, n_heads, repeats, train, queue):
+    torch.manual_seed(0)
+    torch.set_num_threads(1)
+    attention = IMPLEMENTATIONS[impl](d_model, n_heads)
+    attention.train(train)
+    x = torch.randn(batch_size, seq_len, d_model, requires_grad=train)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        if train:
+            out, _ = attention(x, x, x)
+            out.sum().backward()
+        else:
+            with torch.no_grad():
+                attention(x, x, x)
+    elapsed = time.perf_counter() - start
+    queue.put({
+        "impl": impl,
+        "seq_len": seq_len,
+        "batch": batch_size,
+        "samples_per_sec": batch_size * repeats / elapsed,
+        "peak_mb": peak_rss_mb() - baseline,
+    })
+
+
+def check_same_selection(seq_len=48, batch_size=4, d_model=128, n_heads=8):
+    """Both versions score the same sampled keys, so with one seed they must agree."""
+    outputs = []
+    for impl in ("expand", "gather"):
+        torch.manual_seed(0)
+        attention = IMPLEMENTATIONS[impl](d_model, n_heads).eval()
+        x = torch.randn(batch_size, seq_len, d_model)
+        torch.manual_seed(1)
+        with torch.no_grad():
+            outputs.append(attention(x, x, x)[0])
+    return torch.allclose(outputs[0], outputs[1], atol=1e-5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seq-lens", type=int, nargs="+", default=[5, 48, 192, 768])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256])
+    parser.add_argument("--d-model", type=int, default=128)
+    parser.add_argument("--n-heads", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--train", action="store_true", help="Benchmark forward + backward instead of inference")
+    args = parser.parse_args()
+
+    print(f"Same outputs for a fixed seed: {check_same_selection()}")
+    ctx = mp.get_context("spawn")
+    print(f"{'impl':<8}{'seq_len':>8}{'batch':>7}{'samples/s':>12}{'peak MB':>10}")
+    for seq_len in args.seq_lens:
+        for batch_size in args.batch_sizes:
+            for impl in IMPLEMENTATIONS:
+                queue = ctx.Queue()
+                process = ctx.Process(target=run_case, args=(impl, seq_len, batch_size, args.d_model, args.n_heads,
+                                                             args.repeats, args.train, queue))
+                process.start()
+                process.join()
+                if process.exitcode != 0:
+                    print(f"{impl:<8}{seq_len:>8}{batch_size:>7}{'failed (out of memory?)':>22}")
+                    continue
+                r = queue.get()
+                print(f"{r['impl']:<8}{r['seq_len']:>8}{r['batch']:>7}{r['samples_per_sec']:>12.1f}{r['peak_mb']:>10.1f}")
@@ -0,0 +1,119 @@
+"""Train and score every architecture under the same data, seed and threads.
+
+Each model runs in a fresh process so its peak RSS is its own. The data is
+prepared once (same split, same scalers) and handed to every run, and each
+run seeds the model init and the batch order identically. Example:
+
+    python -m model_pipeline.benchmark --threads 4 --epochs 100 --csv output/benchmark.csv
+    python -m model_pipeline.benchmark --train train.csv --val val.csv --test test.csv
+"""
+import argparse
+import multiprocessing as mp
+import os
+import pandas as pd
+import torch
+
+from model_pipeline.dataset import make_loaders
+from model_pipeline.models import MODELS, build_model
+from model_pipeline.predictor import MarketValuePredictor
+from model_pipeline.training import (
+    PreparedData, configure_threads, evaluate, latency_percentiles, load_splits, peak_rss_mb, set_seed, train_model,
+)
+
+
+def build_optimizer(name, model, steps_per_epoch, epochs, lr=1e-4, weight_decay=1e-5):
+    """(optimizer, scheduler, scheduler_step) as in the notebooks: OneCycle for TST, plateau for the rest."""
+    if name == "tst":
+        optimizer = torch.optim.AdamW(model.parameters(), lr=lr, weight_decay=weight_decay)
+        # The notebook peaks at 10x the base learning rate (1e-4 → 1e-3)
+        scheduler = torch.optim.lr_scheduler.OneCycleLR(optimizer, max_lr=lr * 10, steps_per_epoch=steps_per_epoch,
+                                                        epochs=epochs, pct_start=0.3)
+        return optimizer, scheduler, "batch"
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr, weight_decay=weight_decay)
+    scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(optimizer, mode='min', factor=0.5, patience=5)
+    return optimizer, scheduler, "epoch"
+
+
+def run_model(name, data, settings, queue):
+    configure_threads(settings["threads"])
+    set_seed(settings["seed"])
+    train_loader, val_loader, test_loader = make_loaders(*data.arrays(), seq_len=data.seq_len,
+                                                         n_features=data.n_features,
+                                                         batch_size=settings["batch_size"], seed=settings["seed"])
+    model = build_model(name, data.n_features, data.seq_len)
+    optimizer, scheduler, scheduler_step = build_optimizer(name, model, len(train_loader), settings["epochs"])
+    history = train_model(model, train_loader, val_loader, optimizer, scheduler, scheduler_step,
+                          epochs=settings["epochs"], patience=settings["patience"], log_every=0)
+    metrics = evaluate(model, test_loader, data)
+    latency = latency_percentiles(model, test_loader.dataset.X, n_samples=settings["latency_samples"])
+    if settings["save_dir"]:
+        summary = {k: float(metrics[k]) for k in ("MSE", "MAE", "RMSE", "R2", "MAPE")}
+        MarketValuePredictor.from_training(model, name, data, metadata={"seed": settings["seed"], "test": summary}).save(
+            os.path.join(settings["save_dir"], f"{name}.pt"))
+    queue.put({
+        "model": name,
+        "params": sum(p.numel() for p in model.parameters()),
+        "epochs": history["epochs_run"],
+        "best_epoch": history["best_epoch"],
+        "train_s": history["train_time"],
+        "train_samples/s": history["train_samples_per_sec"],
+        "infer_samples/s": metrics["inference_samples_per_sec"],
+        **latency,
+        "peak_rss_mb": peak_rss_mb(),
+        **{k: metrics[k] for k in ("MSE", "MAE", "RMSE", "R2", "MAPE")},
+    })
+
+
+def run_benchmark(models=MODELS, data=None, threads=1, seed=42, epochs=100, patience=15, batch_size=32,
+                  latency_samples=200, save_dir=None):
+    """One row per model; runs that crash are reported with an error instead of metrics."""
+    data = data or PreparedData(*load_splits(seed=seed))
+    settings = {"threads": threads, "seed": seed, "epochs": epochs, "patience": patience,
+                "batch_size": batch_size, "latency_samples": latency_samples, "save_dir": save_dir}
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    ctx = mp.get_context("spawn")
+    rows = []
+    for name in models:
+        print(f"🏋️ Training {name}...")
+        queue = ctx.Queue()
+        process = ctx.Process(target=run_model, args=(name, data, settings, queue))
+        process.start()
+        process.join()
+        if process.exitcode != 0:
+            print(f"❌ {name} failed (exit code {process.exitcode})")
+            rows.append({"model": name, "error": f"exit code {process.exitcode}"})
+            continue
+        rows.append(queue.get())
+    return pd.DataFrame(rows).set_index("model")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", nargs="+", choices=MODELS, default=MODELS)
+    parser.add_argument("--train", default=None, help="Train CSV in the models_dataset layout (needs --val and --test)")
+    parser.add_argument("--val", default=None)
+    parser.add_argument("--test", default=None)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra/inter-op threads for every run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--patience", type=int, default=15)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-samples", type=int, default=200, help="Single-window requests timed per model")
+    parser.add_argument("--csv", default=None, help="Also write the results table to this CSV")
+    parser.add_argument("--save-dir", default=None, help="Save a predictor bundle per model (<model>.pt) here")
+    args = parser.parse_args()
+    if args.train and not (args.val and args.test):
+        parser.error("--train needs --val and --test")
+
+    data = PreparedData(*load_splits(args.train, args.val, args.test, seed=args.seed))
+    print(f"✅ {len(data.X_train)} train / {len(data.X_val)} val / {len(data.X_test)} test windows, "
+          f"{data.n_features} features")
+    results = run_benchmark(args.models, data, threads=args.threads, seed=args.seed, epochs=args.epochs,
+                            patience=args.patience, batch_size=args.batch_size,
+                            latency_samples=args.latency_samples, save_dir=args.save_dir)
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:,.4g}".format):
+        print(results)
+    if args.csv:
+        results.to_csv(args.csv)
+        print(f"Results → {args.csv}")
@@ -0,0 +1,84 @@
+"""Tensor-backed dataset and batch loader shared by the model notebooks.
+
+The notebooks' `FootballDataset.__getitem__` reshapes one NumPy row and
+allocates two tensors per sample, then the default collate stacks them
+again for every batch. Here the scaled arrays are converted once into
+contiguous float32 tensors shaped `(N, seq_len, n_features)`, and batches
+are served by slicing (or one `index_select` when shuffling).
+"""
+import math
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+
+class FootballDataset(Dataset):
+    """Drop-in replacement for the notebooks' dataset with the same arguments."""
+
+    def __init__(self, X, y, seq_len=5, n_features=None, pin_memory=False):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if not n_features:
+            # Flat (N, seq_len * n_features) rows or already (N, seq_len, n_features)
+            n_features = X.shape[1] // seq_len if X.ndim == 2 else X.shape[2]
+        self.seq_len = seq_len
+        self.n_features = n_features
+        self.X = torch.from_numpy(X).view(len(X), seq_len, self.n_features)
+        self.y = torch.from_numpy(np.ascontiguousarray(y, dtype=np.float32)).view(-1)
+        if pin_memory and torch.cuda.is_available():
+            self.X = self.X.pin_memory()
+            self.y = self.y.pin_memory()
+
+    def __len__(self):
+        return len(self.X)
+
+    def __getitem__(self, idx):
+        return self.X[idx], self.y[idx]
+
+
+class TensorBatchLoader:
+    """Iterates over a FootballDataset in batches without a per-sample collate.
+
+    Behaves like `DataLoader(dataset, batch_size, shuffle)` for the training
+    loops: it yields `(xb, yb)` tuples and supports `len()`.
+    """
+
+    def __init__(self, dataset, batch_size=32, shuffle=False, drop_last=False, seed=None):
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        # Without a seed the global RNG shuffles, so torch.manual_seed() controls the order like in DataLoader
+        self.generator = None
+        if seed is not None:
+            self.generator = torch.Generator()
+            self.generator.manual_seed(seed)
+
+    def __len__(self):
+        n = len(self.dataset)
+        return n // self.batch_size if self.drop_last else math.ceil(n / self.batch_size)
+
+    def __iter__(self):
+        X, y = self.dataset.X, self.dataset.y
+        n = len(self.dataset)
+        stop = (n // self.batch_size) * self.batch_size if self.drop_last else n
+        if self.shuffle:
+            order = torch.randperm(n, generator=self.generator)
+            for start in range(0, stop, self.batch_size):
+                idx = order[start:start + self.batch_size]
+                yield X.index_select(0, idx), y.index_select(0, idx)
+        else:
+            # Contiguous slices are views, nothing is copied
+            for start in range(0, stop, self.batch_size):
+                yield X[start:start + self.batch_size], y[start:start + self.batch_size]
+
+
+def make_loaders(X_train, y_train, X_val, y_val, X_test, y_test, seq_len=5, n_features=None,
+                 batch_size=32, pin_memory=False, seed=None):
+    """Train/val/test loaders like the notebooks build them (train shuffled)."""
+    datasets = [FootballDataset(X, y, seq_len=seq_len, n_features=n_features, pin_memory=pin_memory)
+                for X, y in ((X_train, y_train), (X_val, y_val), (X_test, y_test))]
+    return (
+        TensorBatchLoader(datasets[0], batch_size=batch_size, shuffle=True, seed=seed),
+        TensorBatchLoader(datasets[1], batch_size=batch_size, shuffle=False),
+        TensorBatchLoader(datasets[2], batch_size=batch_size, shuffle=False),
+    )
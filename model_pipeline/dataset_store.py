@@ -0,0 +1,159 @@
+"""Typed, columnar copy of data/dataset.csv with a fast loader.
+
+The scraped CSV keeps every value as text: `Bonservis` uses dots as
+thousands separators (`1.200.000`) and `-`/empty mean missing. It is
+parsed once into proper dtypes and cached as Parquet next to the CSV;
+later loads read the Parquet file and only re-parse when the CSV changed.
+"""
+import argparse
+import os
+import re
+import weakref
+import numpy as np
+import pandas as pd
+
+DATASET_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "dataset.csv")
+
+ID_COLUMNS = ["Oyuncu", "Sezon"]
+CATEGORICAL_COLUMNS = ["Uyruk", "Mevki", "Lig", "Kategori"]
+STAT_COLUMNS = [
+    "MP", "DK", "GLS", "AST", "ASR", "TOS", "SOT", "BCM", "KEYP", "BCC", "SDR",
+    "APS", "APS%", "ALB", "LBA%", "ACR", "CA%", "CLS", "YC", "RC", "ELTG", "DRP",
+    "TACK", "INT", "BLS", "ADW", "xG", "xA", "GI", "XGI",
+]
+TARGET_COLUMN = "Bonservis"
+MISSING_VALUES = ["", "-"]
+# Bump when convert_dataset() changes the cached rows, so older Parquet caches are rebuilt
+CACHE_VERSION = 2
+
+
+def cache_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def parse_bonservis(values):
+    # "1.200.000" → 1200000; the dots are thousands separators, not decimals
+    digits = values.astype("string").str.replace(r"[^0-9]", "", regex=True)
+    return pd.to_numeric(digits.replace("", pd.NA), errors="coerce").astype("Int64")
+
+
+def season_start_year(seasons):
+    # "24/25" → 2024, "2024" → 2024
+    def parse(season):
+        if not isinstance(season, str):
+            return np.nan
+        match = re.match(r"^(\d{2})/\d{2}$", season.strip())
+        if match:
+            return 2000 + int(match.group(1))
+        match = re.match(r"^(\d{4})$", season.strip())
+        return int(match.group(1)) if match else np.nan
+    return pd.Series([parse(s) for s in seasons], index=seasons.index).astype("Int16")
+
+
+def convert_dataset(csv_path=DATASET_CSV, out_path=None):
+    """Parse the scraped CSV into typed columns and write the Parquet cache."""
+    out_path = out_path or cache_path_for(csv_path)
+    raw = pd.read_csv(csv_path, dtype=str, na_values=MISSING_VALUES, keep_default_na=False, encoding="utf-8-sig")
+    raw.columns = [c.strip() for c in raw.columns]
+
+    df = pd.DataFrame(index=raw.index)
+    df["Oyuncu"] = raw["Oyuncu"].str.strip().astype("category")
+    df["Sezon"] = raw["Sezon"].str.strip().astype("category")
+    df["Sezon_Yil"] = season_start_year(raw["Sezon"])
+    df["Yaş"] = pd.to_numeric(raw["Yaş"], errors="coerce").astype("Int16")
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = raw[col].str.strip().astype("category")
+    for col in STAT_COLUMNS:
+        df[col] = pd.to_numeric(raw[col], errors="coerce").astype("float32")
+    df[TARGET_COLUMN] = parse_bonservis(raw[TARGET_COLUMN])
+
+    # Rows of a player are stored together and in season order, see DatasetIndex.
+    # Within a season the scraped CSV order is kept, as in models_dataset.csv
+    df = df.sort_values(["Oyuncu", "Sezon_Yil"], kind="stable").reset_index(drop=True)
+    df.attrs["cache_version"] = CACHE_VERSION
+    df.to_parquet(out_path, index=False)
+    return df
+
+
+def load_dataset(csv_path=DATASET_CSV, rebuild=False):
+    """Load the typed dataset, rebuilding the Parquet cache when the CSV is newer."""
+    cache_path = cache_path_for(csv_path)
+    if rebuild or not os.path.exists(cache_path) or os.path.getmtime(cache_path) < os.path.getmtime(csv_path):
+        df = convert_dataset(csv_path, cache_path)
+    else:
+        df = pd.read_parquet(cache_path)
+        if df.attrs.get("cache_version") != CACHE_VERSION:
+            df = convert_dataset(csv_path, cache_path)
+    # Built once here, every later get_player() call is a dict lookup
+    dataset_index(df)
+    return df
+
+
+def row_ranges(keys):
+    """(start, stop) of every run of equal values in the sorted `keys` arrays."""
+    n = len(keys[0])
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    changed = np.zeros(n - 1, dtype=bool)
+    for key in keys:
+        changed |= key[1:] != key[:-1]
+    boundaries = np.flatnonzero(changed) + 1
+    return np.concatenate(([0], boundaries)), np.concatenate((boundaries, [n]))
+
+
+class DatasetIndex:
+    """Row ranges of every player and every (player, season start year) of a loaded frame.
+
+    Relies on the cached frame being sorted by player and season, so the
+    index costs one pass over the categorical codes instead of a groupby.
+    """
+
+    def __init__(self, df):
+        codes = df["Oyuncu"].cat.codes.to_numpy()
+        years = df["Sezon_Yil"].to_numpy(dtype="float64", na_value=np.nan)
+        names = df["Oyuncu"].cat.categories
+        self.players = {names[codes[start]]: (int(start), int(stop)) for start, stop in zip(*row_ranges([codes]))}
+        # NaN != NaN, so rows without a parsed season are split up; they are left out of the season lookup
+        self.seasons = {(names[codes[start]], int(years[start])): (int(start), int(stop))
+                        for start, stop in zip(*row_ranges([codes, years])) if not np.isnan(years[start])}
+
+
+# Index of every frame passed to dataset_index(), dropped together with the frame
+_INDEXES = {}
+
+
+def dataset_index(df):
+    """The DatasetIndex of `df`, built on first use. Do not reorder the frame in place afterwards."""
+    key = id(df)
+    if key not in _INDEXES:
+        _INDEXES[key] = DatasetIndex(df)
+        weakref.finalize(df, _INDEXES.pop, key, None)
+    return _INDEXES[key]
+
+
+def player_slices(df):
+    """Map each player to the (start, stop) row range of their seasons."""
+    return dataset_index(df).players
+
+
+def get_player(df, player, slices=None, season=None):
+    """Rows of `player`, or only those of one `season` (start year, e.g. 2024 for "24/25")."""
+    if season is not None:
+        start, stop = dataset_index(df).seasons[(player, int(season))]
+    else:
+        slices = slices if slices is not None else dataset_index(df).players
+        start, stop = slices[player]
+    return df.iloc[start:stop]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert data/dataset.csv into the typed Parquet cache.")
+    parser.add_argument("csv_path", nargs="?", default=DATASET_CSV)
+    args = parser.parse_args()
+
+    raw = pd.read_csv(args.csv_path, dtype=str, keep_default_na=False)
+    df = convert_dataset(args.csv_path)
+    raw_mb = raw.memory_usage(deep=True).sum() / 1e6
+    typed_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"✅ {len(df)} rows → {cache_path_for(args.csv_path)}")
+    print(f"Memory: {raw_mb:.2f} MB as text → {typed_mb:.2f} MB typed")
@@ -0,0 +1,227 @@
+"""TorchScript / ONNX export and dynamic int8 quantization for CPU serving.
+
+For every predictor bundle this writes a traced and frozen TorchScript graph
+(`<model>.ts`) and a dynamically quantized int8 variant (`<model>.int8.ts`),
+both loadable by `MarketValuePredictor.load()` and the HTTP server. With
+`--onnx` it also writes ONNX graphs when the `onnx` package is installed
+(and checks/times them when `onnxruntime` is). Each variant is checked
+against the eager model on the same test windows and reported with its
+file size, single-request latency and batch throughput. Example:
+
+    python -m model_pipeline.benchmark --save-dir models/
+    python -m model_pipeline.export models/*.pt --out-dir models/ --threads 1 --csv output/export.csv
+
+Differences are measured on the standardized target (1.0 = one standard
+deviation of the market value). fp32 graphs must match the eager model on
+every window (max abs diff); int8 variants are held to the mean abs diff,
+since quantization error is per-window noise with a few larger outliers.
+"""
+import argparse
+import io
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+
+from model_pipeline.predictor import TORCHSCRIPT_CONFIG, TORCHSCRIPT_SUFFIX, MarketValuePredictor
+from model_pipeline.training import (
+    LATENCY_PERCENTILES, configure_threads, latency_percentiles, load_splits, regression_metrics,
+)
+
+FP32_TOLERANCE = 1e-4
+INT8_TOLERANCE = 0.05
+THROUGHPUT_BATCH_SIZE = 256
+QUANTIZED_MODULES = (nn.Linear, nn.LSTM)
+
+
+class PredictionHead(nn.Module):
+    """Drops EnhancedTST's attention weights so every graph returns one tensor."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, x):
+        out = self.model(x)
+        return out[0] if isinstance(out, tuple) else out
+
+
+def quantization_targets(model):
+    """Names of the Linear/LSTM modules that can be swapped for dynamic int8 versions.
+
+    Layers inside `nn.TransformerEncoderLayer` are left in float: the encoder's
+    fast-path check reads `linear1.weight.device`, which quantized layers do
+    not have. This mostly affects ImprovedAutoformer.
+    """
+    skip = set()
+    for name, module in model.named_modules():
+        if isinstance(module, nn.TransformerEncoderLayer):
+            skip.update(f"{name}.{child}" for child, _ in module.named_modules() if child)
+    return {name for name, module in model.named_modules()
+            if type(module) in QUANTIZED_MODULES and name not in skip}
+
+
+def quantize_int8(model):
+    return torch.ao.quantization.quantize_dynamic(model, quantization_targets(model), dtype=torch.qint8)
+
+
+def trace(model, example):
+    """Trace and freeze; the graph is checked against the eager model by the caller instead of
+    `check_trace`, which flags nn.MultiheadAttention's fast path as a graph change."""
+    with torch.no_grad():
+        traced = torch.jit.trace(model.eval(), example, check_trace=False)
+    return torch.jit.freeze(traced)
+
+
+def export_torchscript(predictor, path, example, quantize=False):
+    model = PredictionHead(predictor.model).eval()
+    if quantize:
+        model = quantize_int8(model)
+    graph = trace(model, example)
+    exported = predictor.with_model(graph, export="torchscript", quantized=quantize)
+    torch.jit.save(graph, path, _extra_files={TORCHSCRIPT_CONFIG: json.dumps(exported.config())})
+    return exported
+
+
+def export_onnx(predictor, path, example, quantize=False):
+    """ONNX graph through onnxruntime; returns a `predict_scaled`-like callable, or None without onnxruntime."""
+    import onnx  # noqa: F401  (torch.onnx.export needs it)
+
+    fp32_path = path if not quantize else path.replace(".int8.onnx", ".onnx")
+    if not os.path.exists(fp32_path):
+        torch.onnx.export(PredictionHead(predictor.model).eval(), (example,), fp32_path, input_names=["x"],
+                          output_names=["value"], dynamic_axes={"x": {0: "batch"}, "value": {0: "batch"}},
+                          dynamo=False)
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return None
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = torch.get_num_threads()
+    session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+    return lambda X: session.run(None, {"x": np.ascontiguousarray(X, dtype=np.float32)})[0].reshape(-1)
+
+
+def file_mb(path):
+    return os.path.getsize(path) / 1e6
+
+
+def state_dict_mb(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / 1e6
+
+
+def time_variant(predict_fn, X, latency_samples):
+    """Single-window latency percentiles (ms) and samples/sec at THROUGHPUT_BATCH_SIZE."""
+    class Wrapped(nn.Module):
+        def forward(self, x):
+            return torch.as_tensor(predict_fn(x))
+
+    timings = latency_percentiles(Wrapped(), X, n_samples=latency_samples)
+    batch = X[:THROUGHPUT_BATCH_SIZE]
+    predict_fn(batch)
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict_fn(batch)
+    timings["samples/s"] = len(batch) * repeats / (time.perf_counter() - start)
+    return timings
+
+
+def export_bundle(bundle_path, out_dir, X_test, y_test=None, onnx=False, latency_samples=200,
+                  fp32_tolerance=FP32_TOLERANCE, int8_tolerance=INT8_TOLERANCE):
+    """Export one bundle in every format and compare each against the eager model."""
+    predictor = MarketValuePredictor.load(bundle_path)
+    name = os.path.splitext(os.path.basename(bundle_path))[0]
+    X = predictor.transform(X_test)
+    example = X[:2]
+    reference = predictor.predict_scaled(X)
+
+    variants = {"eager fp32": (predictor.predict_scaled, state_dict_mb(predictor.model), None)}
+    for quantize in (False, True):
+        label = "torchscript int8" if quantize else "torchscript fp32"
+        path = os.path.join(out_dir, f"{name}{'.int8' if quantize else ''}{TORCHSCRIPT_SUFFIX}")
+        try:
+            exported = export_torchscript(predictor, path, example, quantize=quantize)
+            variants[label] = (exported.predict_scaled, file_mb(path), path)
+        except Exception as e:
+            print(f"❌ {name} {label}: {e}")
+        if onnx:
+            label = label.replace("torchscript", "onnx")
+            path = os.path.join(out_dir, f"{name}{'.int8' if quantize else ''}.onnx")
+            try:
+                run = export_onnx(predictor, path, example, quantize=quantize)
+            except ImportError:
+                print("⚠️ onnx is not installed, skipping the ONNX export")
+                onnx = False
+                continue
+            except Exception as e:
+                print(f"❌ {name} {label}: {e}")
+                continue
+            if run is None:
+                print(f"⚠️ onnxruntime is not installed, cannot quantize or check {label}")
+                continue
+            variants[label] = (run, file_mb(path), path)
+
+    rows = []
+    for label, (predict_fn, size_mb, path) in variants.items():
+        out = np.asarray(predict_fn(X)).reshape(-1)
+        diff = np.abs(out - reference)
+        checked = diff.mean() <= int8_tolerance if "int8" in label else diff.max() <= fp32_tolerance
+        row = {"model": name, "variant": label, "size_mb": size_mb, "max_abs_diff": float(diff.max()),
+               "mean_abs_diff": float(diff.mean()), "within_tolerance": bool(checked),
+               **time_variant(predict_fn, X, latency_samples)}
+        if y_test is not None:
+            row["MAE"] = regression_metrics(y_test, predictor.inverse_y(out))["MAE"]
+        row["path"] = path
+        rows.append(row)
+    results = pd.DataFrame(rows)
+    eager = results.iloc[0]
+    results["size_gain"] = eager["size_mb"] / results["size_mb"]
+    results["p50_speedup"] = eager[f"p{LATENCY_PERCENTILES[0]}_ms"] / results[f"p{LATENCY_PERCENTILES[0]}_ms"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundles", nargs="+", help="Predictor bundles (.pt) written by the benchmark --save-dir")
+    parser.add_argument("--out-dir", default=None, help="Where to write the exports (default: next to each bundle)")
+    parser.add_argument("--test", default=None, help="Wide-layout test CSV (default: dataset.csv player split)")
+    parser.add_argument("--seed", type=int, default=42, help="Split seed when --test is not given")
+    parser.add_argument("--onnx", action="store_true", help="Also export ONNX (needs onnx; onnxruntime to check it)")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--fp32-tolerance", type=float, default=FP32_TOLERANCE)
+    parser.add_argument("--int8-tolerance", type=float, default=INT8_TOLERANCE)
+    parser.add_argument("--csv", default=None, help="Also write the report to this CSV")
+    args = parser.parse_args()
+
+    configure_threads(args.threads)
+    test = pd.read_csv(args.test) if args.test else load_splits(seed=args.seed)[2]
+    reports = []
+    for bundle in args.bundles:
+        out_dir = args.out_dir or os.path.dirname(bundle) or "."
+        os.makedirs(out_dir, exist_ok=True)
+        print(f"📦 Exporting {bundle}...")
+        predictor = MarketValuePredictor.load(bundle)
+        X_test = predictor.frame_array(test)
+        y_test = test["target"].to_numpy(dtype=np.float64) if "target" in test else None
+        reports.append(export_bundle(bundle, out_dir, X_test, y_test, onnx=args.onnx,
+                                     latency_samples=args.latency_samples, fp32_tolerance=args.fp32_tolerance,
+                                     int8_tolerance=args.int8_tolerance))
+    report = pd.concat(reports, ignore_index=True)
+    with pd.option_context("display.width", 220, "display.max_columns", None, "display.float_format", "{:,.4g}".format):
+        print(report.drop(columns=["path"]).to_string(index=False))
+    if not report["within_tolerance"].all():
+        print("⚠️ Some variants differ from the eager model by more than the tolerance")
+    if args.csv:
+        report.to_csv(args.csv, index=False)
+        print(f"Report → {args.csv}")
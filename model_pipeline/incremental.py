@@ -0,0 +1,368 @@
+"""Versioned models that are updated incrementally when dataset.csv grows.
+
+A registry directory holds one sub-directory per model version and a
+`versions.json` log. Every version stores the predictor bundle, the scaler
+statistics (with their sample counts) and a manifest fingerprinting every
+window it was trained on. `update` compares the current windows against the
+manifest of the latest version and only does work for the difference:
+
+- windows are keyed by player and position inside the player's history, so
+  an appended season creates new keys while a rescraped row changes hashes;
+- the scalers are updated online with `partial_fit()` on the new/changed
+  training windows;
+- the previous best model is fine-tuned on those windows plus a replay
+  sample of unchanged ones, then checked on the full validation split: it
+  only becomes the current version when its validation MSE is no worse
+  than the parent's on the same windows (within `--tolerance`); otherwise
+  the parent stays current and the attempt is logged under "rejected".
+
+    python -m model_pipeline.incremental init tft --registry models/tft
+    python -m model_pipeline.incremental update --registry models/tft
+    python -m model_pipeline.incremental status --registry models/tft
+
+Players keep their train/val/test split across versions; new players are
+assigned by a hash of their name, so the evaluation sets never leak.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.preprocessing import StandardScaler
+
+from model_pipeline.benchmark import build_optimizer
+from model_pipeline.dataset import make_loaders
+from model_pipeline.dataset_store import DATASET_CSV, load_dataset
+from model_pipeline.models import MODELS, build_model
+from model_pipeline.predictor import MarketValuePredictor
+from model_pipeline.training import (
+    configure_threads, evaluate, fitted_scaler, predict, regression_metrics, set_seed, train_model,
+)
+from model_pipeline.windows import SEQ_LEN, build_windows
+
+VERSIONS_FILE = "versions.json"
+SPLITS = ("train", "val", "test")
+VAL_FRAC = 0.15
+TEST_FRAC = 0.15
+# Above this share of new/changed windows a full retrain is cheaper than patching
+MAX_DELTA_FRACTION = 0.3
+# Relative val MSE increase a fine-tuned model may have over its parent and still be promoted
+PROMOTE_TOLERANCE = 0.0
+
+
+# ---- Data fingerprints ------------------------------------------------------
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stable_split(player, val_frac=VAL_FRAC, test_frac=TEST_FRAC):
+    # Depends only on the name, so a player lands in the same split in every version
+    u = int(hashlib.sha1(player.encode("utf-8")).hexdigest()[:8], 16) / 2 ** 32
+    return "test" if u < test_frac else "val" if u < test_frac + val_frac else "train"
+
+
+class WindowTable:
+    """Flat inputs, targets, keys, content hashes and players of every current window.
+
+    Hashes are taken over the scraped rows, not the model inputs: missing
+    stats are imputed with dataset-wide medians, so every new season nudges
+    the imputed values of unrelated windows.
+    """
+
+    def __init__(self, df, windows):
+        self.X = np.nan_to_num(windows.to_flat().astype(np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+        self.y = np.nan_to_num(windows.targets.astype(np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+        self.features = windows.feature_names
+        self.seq_len = windows.seq_len
+        # First season row of each player; window keys are relative to it
+        codes = windows.player_ids
+        first_row = np.full(codes.max() + 1 if len(codes) else 0, -1, dtype=np.int64)
+        unique_codes, first_index = np.unique(codes, return_index=True)
+        first_row[unique_codes[unique_codes >= 0]] = first_index[unique_codes >= 0]
+        names = np.asarray(windows.player_names, dtype=object)
+        self.players = names[windows.oyuncu_ids]
+        offsets = windows.starts - first_row[windows.oyuncu_ids]
+        self.keys = [f"{player}|{offset}" for player, offset in zip(self.players, offsets)]
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        rows = sliding_window_view(row_hashes, windows.seq_len)[windows.starts]
+        self.hashes = [hashlib.sha1(window.tobytes()).hexdigest()[:16] for window in rows]
+
+    def __len__(self):
+        return len(self.y)
+
+    def splits(self, known=None):
+        """Split of every window; players already in `known` keep their assignment."""
+        known = known or {}
+        return np.array([known.get(player) or stable_split(player) for player in self.players])
+
+    def manifest(self, splits):
+        return {
+            "windows": dict(zip(self.keys, self.hashes)),
+            "players": {player: split for player, split in zip(self.players, splits)},
+        }
+
+
+def window_delta(table, manifest):
+    """Boolean masks of new and changed windows plus the number of removed ones."""
+    previous = manifest["windows"]
+    new = np.array([key not in previous for key in table.keys], dtype=bool)
+    changed = np.array([key in previous and previous[key] != h for key, h in zip(table.keys, table.hashes)],
+                       dtype=bool)
+    removed = len(set(previous) - set(table.keys))
+    return new, changed, removed
+
+
+# ---- Registry ---------------------------------------------------------------
+
+def load_registry(registry):
+    path = os.path.join(registry, VERSIONS_FILE)
+    if not os.path.exists(path):
+        return {"model": None, "current": None, "versions": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def version_dir(registry, version):
+    return os.path.join(registry, f"v{version:04d}")
+
+
+def save_scalers(path, scaler_X, scaler_y):
+    np.savez(path, **{f"{prefix}_{attr}": getattr(scaler, f"{attr}_")
+                      for prefix, scaler in (("x", scaler_X), ("y", scaler_y))
+                      for attr in ("mean", "scale", "var", "n_samples_seen")})
+
+
+def load_scalers(path):
+    data = np.load(path)
+    return tuple(fitted_scaler(data[f"{p}_mean"], data[f"{p}_scale"], data[f"{p}_var"], data[f"{p}_n_samples_seen"])
+                 for p in ("x", "y"))
+
+
+def save_version(registry, state, predictor, scaler_X, scaler_y, manifest, entry):
+    version = len(state["versions"]) + 1
+    directory = version_dir(registry, version)
+    os.makedirs(directory, exist_ok=True)
+    predictor.metadata.update({"version": version, "dataset_sha1": entry["data"]["dataset_sha1"]})
+    predictor.save(os.path.join(directory, "model.pt"))
+    save_scalers(os.path.join(directory, "scalers.npz"), scaler_X, scaler_y)
+    with open(os.path.join(directory, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    entry = {"version": version, "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+             "bundle": os.path.join(os.path.basename(directory), "model.pt"), **entry}
+    state["versions"].append(entry)
+    state["current"] = version
+    with open(os.path.join(registry, VERSIONS_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    return entry
+
+
+# ---- Training ---------------------------------------------------------------
+
+def scaled(X, y, scaler_X, scaler_y):
+    return (scaler_X.transform(X).astype(np.float32),
+            scaler_y.transform(y.reshape(-1, 1)).flatten().astype(np.float32))
+
+
+def fit_and_score(model_name, model, table, splits, train_idx, scaler_X, scaler_y, epochs, patience, lr, batch_size,
+                  seed):
+    """Train on `train_idx`, keep the best weights on the val split, score val and test."""
+    arrays = []
+    for idx in (train_idx, np.flatnonzero(splits == "val"), np.flatnonzero(splits == "test")):
+        arrays.extend(scaled(table.X[idx], table.y[idx], scaler_X, scaler_y))
+    set_seed(seed)
+    train_loader, val_loader, test_loader = make_loaders(*arrays, seq_len=table.seq_len,
+                                                         n_features=len(table.features), batch_size=batch_size,
+                                                         seed=seed)
+    predictor = MarketValuePredictor(model, model_name, table.features, scaler_X.mean_, scaler_X.scale_,
+                                     scaler_y.mean_[0], scaler_y.scale_[0], seq_len=table.seq_len)
+    val_before = float(np.mean((np.subtract(*predict(model, val_loader))) ** 2))
+    optimizer, scheduler, scheduler_step = build_optimizer(model_name, model, len(train_loader), epochs, lr=lr)
+    history = train_model(model, train_loader, val_loader, optimizer, scheduler, scheduler_step, epochs=epochs,
+                          patience=patience, log_every=5)
+    metrics = {split: {k: float(v) for k, v in evaluate(model, loader, predictor).items()
+                       if k in ("MSE", "MAE", "RMSE", "R2", "MAPE")}
+               for split, loader in (("val", val_loader), ("test", test_loader))}
+    training = {"epochs": history["epochs_run"], "best_epoch": history["best_epoch"],
+                "train_s": round(history["train_time"], 2), "train_windows": int(len(train_idx)),
+                "val_loss_before": val_before, "val_loss_after": history["best_val_loss"]}
+    return predictor, metrics, training
+
+
+def data_entry(table, dataset_sha1, new=None, changed=None, removed=0):
+    return {"dataset_sha1": dataset_sha1, "windows": len(table),
+            "new": int(new.sum()) if new is not None else len(table),
+            "changed": int(changed.sum()) if changed is not None else 0, "removed": removed}
+
+
+def full_train(registry, model_name, table, dataset_sha1, state, known_splits=None, parent=None, epochs=100,
+               patience=15, lr=1e-4, batch_size=32, seed=42, model_params=None, data=None):
+    splits = table.splits(known_splits)
+    train_idx = np.flatnonzero(splits == "train")
+    scaler_X = StandardScaler().fit(table.X[train_idx])
+    scaler_y = StandardScaler().fit(table.y[train_idx].reshape(-1, 1))
+    set_seed(seed)
+    model = build_model(model_name, len(table.features), table.seq_len, **(model_params or {}))
+    predictor, metrics, training = fit_and_score(model_name, model, table, splits, train_idx, scaler_X, scaler_y,
+                                                 epochs, patience, lr, batch_size, seed)
+    predictor.model_params = dict(model_params or {})
+    entry = {"parent": parent, "mode": "full", "data": data or data_entry(table, dataset_sha1), "training": training,
+             "metrics": metrics}
+    return save_version(registry, state, predictor, scaler_X, scaler_y, table.manifest(splits), entry)
+
+
+def reject_update(registry, state, entry):
+    entry = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), **entry}
+    state.setdefault("rejected", []).append(entry)
+    with open(os.path.join(registry, VERSIONS_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    return entry
+
+
+def incremental_update(registry, table, dataset_sha1, state, epochs=20, patience=5, lr=5e-5, batch_size=32,
+                       replay=1.0, min_replay=256, max_delta=MAX_DELTA_FRACTION, tolerance=PROMOTE_TOLERANCE,
+                       seed=42):
+    """Fine-tune the current version on the new/changed windows.
+
+    Returns the new entry, or None when nothing changed or the fine-tuned
+    model did worse on validation than the current version.
+    """
+    current = state["versions"][state["current"] - 1]
+    directory = version_dir(registry, current["version"])
+    with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    previous = MarketValuePredictor.load(os.path.join(directory, "model.pt"))
+    if previous.features != table.features or previous.seq_len != table.seq_len:
+        raise ValueError("The window features changed since the last version, run `init` for a full retrain")
+
+    new, changed, removed = window_delta(table, manifest)
+    delta = new | changed
+    print(f"📊 {len(table)} windows: {new.sum()} new, {changed.sum()} changed, {removed} removed "
+          f"since v{current['version']}")
+    if not delta.any() and not removed:
+        print("✅ Nothing changed, keeping the current version")
+        return None
+
+    splits = table.splits(manifest["players"])
+    if delta.mean() > max_delta:
+        print(f"⚠️ {delta.mean():.0%} of the windows changed, running a full retrain instead")
+        return full_train(registry, state["model"], table, dataset_sha1, state, manifest["players"],
+                          parent=current["version"], epochs=max(epochs, 100), lr=1e-4, batch_size=batch_size,
+                          seed=seed, model_params=previous.model_params,
+                          data=data_entry(table, dataset_sha1, new, changed, removed))
+
+    # Online scaler update from the new/changed training windows only
+    scaler_X, scaler_y = load_scalers(os.path.join(directory, "scalers.npz"))
+    delta_train = np.flatnonzero(delta & (splits == "train"))
+    if len(delta_train):
+        scaler_X.partial_fit(table.X[delta_train])
+        scaler_y.partial_fit(table.y[delta_train].reshape(-1, 1))
+
+    # Replay unchanged training windows so the fine-tune does not forget them
+    unchanged_train = np.flatnonzero(~delta & (splits == "train"))
+    n_replay = min(len(unchanged_train), max(int(replay * len(delta_train)), min_replay))
+    replay_idx = np.random.default_rng(seed).choice(unchanged_train, size=n_replay, replace=False)
+    train_idx = np.concatenate([delta_train, replay_idx])
+    print(f"🔁 Fine-tuning v{current['version']} on {len(delta_train)} new/changed + {n_replay} replayed windows")
+
+    # The parent as it is served (its own scalers) on today's validation windows
+    val_idx = np.flatnonzero(splits == "val")
+    parent_val = regression_metrics(table.y[val_idx], previous.predict(table.X[val_idx]))
+    predictor, metrics, training = fit_and_score(state["model"], previous.model, table, splits, train_idx, scaler_X,
+                                                 scaler_y, epochs, patience, lr, batch_size, seed)
+    predictor.model_params = previous.model_params
+    training["replay_windows"] = int(n_replay)
+    entry = {"parent": current["version"], "mode": "incremental",
+             "data": data_entry(table, dataset_sha1, new, changed, removed), "training": training,
+             "metrics": metrics, "parent_val": {k: float(v) for k, v in parent_val.items()}}
+    if metrics["val"]["MSE"] > parent_val["MSE"] * (1 + tolerance):
+        print(f"⛔ Fine-tuned model failed the validation check (MSE {metrics['val']['MSE']:.4g} vs parent "
+              f"{parent_val['MSE']:.4g}, tolerance {tolerance:+.0%}), keeping v{current['version']}")
+        reject_update(registry, state, entry)
+        return None
+    return save_version(registry, state, predictor, scaler_X, scaler_y, table.manifest(splits), entry)
+
+
+def print_status(state):
+    if not state["versions"]:
+        print("No versions yet, run `init` first")
+        return
+    print(f"{'ver':>4} {'parent':>6} {'mode':<12}{'windows':>8}{'new':>6}{'chg':>6}{'train s':>9}"
+          f"{'val MAE':>14}{'test MAE':>14}")
+    for v in state["versions"]:
+        marker = "*" if v["version"] == state["current"] else " "
+        print(f"{v['version']:>3}{marker} {str(v['parent'] or '-'):>6} {v['mode']:<12}{v['data']['windows']:>8}"
+              f"{v['data']['new']:>6}{v['data']['changed']:>6}{v['training']['train_s']:>9.1f}"
+              f"{v['metrics']['val']['MAE']:>14,.0f}{v['metrics']['test']['MAE']:>14,.0f}")
+    for r in state.get("rejected", []):
+        print(f"   rejected update of v{r['parent']} ({r['created']}): val MAE {r['metrics']['val']['MAE']:,.0f} "
+              f"vs parent {r['parent_val']['MAE']:,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    init = sub.add_parser("init", help="Train version 1 from scratch")
+    init.add_argument("model", choices=MODELS)
+    update = sub.add_parser("update", help="Fine-tune the current version on what changed in dataset.csv")
+    status = sub.add_parser("status", help="List the versions")
+    for p in (init, update, status):
+        p.add_argument("--registry", required=True, help="Directory holding the versions of one model")
+    for p in (init, update):
+        p.add_argument("--csv", default=DATASET_CSV, help="Scraped dataset (default: data/dataset.csv)")
+        p.add_argument("--threads", type=int, default=1)
+        p.add_argument("--batch-size", type=int, default=32)
+        p.add_argument("--seed", type=int, default=42)
+    init.add_argument("--epochs", type=int, default=100)
+    init.add_argument("--patience", type=int, default=15)
+    init.add_argument("--lr", type=float, default=1e-4)
+    update.add_argument("--epochs", type=int, default=20)
+    update.add_argument("--patience", type=int, default=5)
+    update.add_argument("--lr", type=float, default=5e-5, help="Fine-tuning learning rate")
+    update.add_argument("--replay", type=float, default=1.0, help="Replayed unchanged windows per new/changed one")
+    update.add_argument("--min-replay", type=int, default=256)
+    update.add_argument("--max-delta", type=float, default=MAX_DELTA_FRACTION,
+                        help="Share of new/changed windows above which a full retrain runs instead")
+    update.add_argument("--tolerance", type=float, default=PROMOTE_TOLERANCE,
+                        help="Relative val MSE increase over the parent still accepted for promotion")
+    args = parser.parse_args()
+
+    state = load_registry(args.registry)
+    if args.command == "status":
+        print_status(state)
+        raise SystemExit(0)
+
+    configure_threads(args.threads)
+    start = time.perf_counter()
+    df = load_dataset(args.csv)
+    table = WindowTable(df, build_windows(df, seq_len=SEQ_LEN))
+    dataset_sha1 = file_sha1(args.csv)
+    print(f"✅ {len(table)} windows from {args.csv} in {time.perf_counter() - start:.2f}s")
+
+    if args.command == "init":
+        if state["versions"]:
+            parser.error(f"{args.registry} already has versions, use `update`")
+        os.makedirs(args.registry, exist_ok=True)
+        state["model"] = args.model
+        entry = full_train(args.registry, args.model, table, dataset_sha1, state, epochs=args.epochs,
+                           patience=args.patience, lr=args.lr, batch_size=args.batch_size, seed=args.seed)
+    else:
+        if not state["versions"]:
+            parser.error(f"{args.registry} has no versions yet, run `init` first")
+        entry = incremental_update(args.registry, table, dataset_sha1, state, epochs=args.epochs,
+                                   patience=args.patience, lr=args.lr, batch_size=args.batch_size,
+                                   replay=args.replay, min_replay=args.min_replay, max_delta=args.max_delta,
+                                   tolerance=args.tolerance, seed=args.seed)
+    if entry:
+        print(f"💾 v{entry['version']} ({entry['mode']}) → {os.path.join(args.registry, entry['bundle'])}")
+        print(f"   val MAE {entry['metrics']['val']['MAE']:,.0f} | test MAE {entry['metrics']['test']['MAE']:,.0f} | "
+              f"{entry['training']['train_s']:.1f}s training")
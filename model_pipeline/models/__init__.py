@@ -0,0 +1,39 @@
+from model_pipeline.models.autoformer import ImprovedAutoformer
+from model_pipeline.models.informer import InformerModel, ProbSparseAttention
+from model_pipeline.models.reformer import Reformer
+from model_pipeline.models.tft import SimpleTFT
+from model_pipeline.models.tst import EnhancedTST
+from model_pipeline.windows import SEQ_LEN
+
+# Hyperparameters each notebook trains with; build_model() keyword arguments override them
+MODEL_DEFAULTS = {
+    "tft": {"hidden_size": 64, "output_size": 1, "num_layers": 1, "dropout": 0.3},
+    "tst": {"d_model": 128, "n_heads": 8, "num_layers": 3, "d_ff": 256, "output_size": 1, "dropout": 0.2},
+    "informer": {"d_model": 128, "n_heads": 8, "e_layers": 3, "d_ff": 256, "dropout": 0.3, "activation": 'gelu',
+                 "distil": True, "output_attention": False},
+    "autoformer": {"d_model": 128, "nhead": 4, "num_layers": 2, "dropout": 0.3},
+    "reformer": {"d_model": 128, "n_heads": 4, "n_layers": 3, "bucket_size": 16, "dropout": 0.3, "out_dim": 1},
+}
+MODELS = list(MODEL_DEFAULTS)
+
+
+def build_model(name, n_features, seq_len=SEQ_LEN, **params):
+    """An architecture with its notebook hyperparameters, updated with `params`."""
+    if name not in MODEL_DEFAULTS:
+        raise ValueError(f"Unknown model: {name}")
+    kwargs = {**MODEL_DEFAULTS[name], **params}
+    if name == "tft":
+        return SimpleTFT(n_features=n_features, **kwargs)
+    if name == "tst":
+        return EnhancedTST(n_features=n_features, max_len=seq_len, **kwargs)
+    if name == "informer":
+        return InformerModel(seq_len=seq_len, n_features=n_features, **kwargs)
+    if name == "autoformer":
+        return ImprovedAutoformer(seq_len=seq_len, n_features=n_features, **kwargs)
+    return Reformer(seq_len=seq_len, n_features=n_features, **kwargs)
+
+
+__all__ = [
+    "EnhancedTST", "ImprovedAutoformer", "InformerModel", "ProbSparseAttention", "Reformer", "SimpleTFT",
+    "MODEL_DEFAULTS", "MODELS", "build_model",
+]
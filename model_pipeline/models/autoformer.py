@@ -0,0 +1,29 @@
+"""Autoformer-style Transformer encoder regressor (from Autoformer.ipynb)."""
+import torch.nn as nn
+
+
+class ImprovedAutoformer(nn.Module):
+    def __init__(self, seq_len, n_features, d_model=64, nhead=4, num_layers=2, dropout=0.3, out_dim=1):
+        super().__init__()
+        self.input_proj = nn.Linear(n_features, d_model)
+        self.dropout = nn.Dropout(dropout)
+        encoder_layer = nn.TransformerEncoderLayer(
+            d_model=d_model, nhead=nhead, dim_feedforward=d_model*4, dropout=dropout, batch_first=True
+        )
+        self.transformer_encoder = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
+        self.global_pool = nn.AdaptiveAvgPool1d(1)
+        self.fc = nn.Sequential(
+            nn.Linear(d_model, d_model//2),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(d_model//2, out_dim)
+        )
+
+    def forward(self, x):
+        x = self.input_proj(x)
+        x = self.dropout(x)
+        x = self.transformer_encoder(x)
+        x = x.transpose(1,2)
+        x = self.global_pool(x).squeeze(-1)
+        out = self.fc(x).squeeze(-1)
+        return out
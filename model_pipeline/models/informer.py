@@ -0,0 +1,203 @@
+"""Informer encoder for market-value regression (from Informer.ipynb)."""
+import math
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class PositionalEncoding(nn.Module):
+    def __init__(self, d_model, max_len=5000):
+        super().__init__()
+        pe = torch.zeros(max_len, d_model)
+        position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
+        div_term = torch.exp(torch.arange(0, d_model, 2).float() * (-math.log(10000.0) / d_model))
+        pe[:, 0::2] = torch.sin(position * div_term)
+        pe[:, 1::2] = torch.cos(position * div_term)
+        pe = pe.unsqueeze(0).transpose(0, 1)
+        self.register_buffer('pe', pe)
+    def forward(self, x):
+        # x is batch-first: positions run along dim 1 (the notebook indexed by batch size)
+        return x + self.pe[:x.size(1)].transpose(0, 1)
+
+class ProbSparseAttention(nn.Module):
+    sample_chunk = 8
+    def __init__(self, d_model, n_heads, factor=5, dropout=0.1):
+        super().__init__()
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.d_k = d_model // n_heads
+        self.factor = factor
+        self.w_q = nn.Linear(d_model, d_model, bias=False)
+        self.w_k = nn.Linear(d_model, d_model, bias=False)
+        self.w_v = nn.Linear(d_model, d_model, bias=False)
+        self.w_o = nn.Linear(d_model, d_model)
+        self.dropout = nn.Dropout(dropout)
+    def _prob_QK(self, Q, K, sample_k, n_top):
+        B, H, L_K, E = K.shape
+        _, _, L_Q, _ = Q.shape
+        index_sample = torch.randint(L_K, (L_Q, sample_k), device=K.device)
+        # M only selects the top queries, so it needs no gradient. The sampled keys are
+        # gathered instead of indexing a (B, H, L_Q, L_K, E) expand of K.
+        with torch.no_grad():
+            if L_K <= sample_k:
+                # Short sequences: full scores are no bigger than the samples, one matmul + gather
+                Q_K_full = torch.matmul(Q, K.transpose(-2, -1))
+                Q_K_sample = Q_K_full.gather(-1, index_sample.expand(B, H, L_Q, sample_k))
+                M = Q_K_sample.max(-1)[0] - torch.div(Q_K_sample.sum(-1), L_K)
+            else:
+                # Long sequences: gather `sample_chunk` keys per query at a time, keep running max/sum
+                M_max = torch.full((B, H, L_Q), float('-inf'), dtype=Q.dtype, device=Q.device)
+                M_sum = torch.zeros((B, H, L_Q), dtype=Q.dtype, device=Q.device)
+                for s in range(0, sample_k, self.sample_chunk):
+                    idx = index_sample[:, s:s + self.sample_chunk]
+                    K_chunk = K.index_select(2, idx.reshape(-1)).view(B, H, L_Q, idx.shape[1], E)
+                    q_k = torch.matmul(K_chunk, Q.unsqueeze(-1)).squeeze(-1)
+                    M_max = torch.maximum(M_max, q_k.max(-1)[0])
+                    M_sum += q_k.sum(-1)
+                M = M_max - torch.div(M_sum, L_K)
+        M_top = M.topk(n_top, sorted=False)[1]
+        Q_reduce = Q[torch.arange(B)[:, None, None],
+                     torch.arange(H)[None, :, None],
+                     M_top, :]
+        Q_K = torch.matmul(Q_reduce, K.transpose(-2, -1))
+        return Q_K, M_top
+    def _get_initial_context(self, V, L_Q):
+        B, H, L_V, D = V.shape
+        if not self.training:
+            V_sum = V.mean(dim=-2)
+            contex = V_sum.unsqueeze(-2).expand(B, H, L_Q, V_sum.shape[-1]).clone()
+        else:
+            assert(L_Q == L_V)
+            contex = V.cumsum(dim=-2)
+        return contex
+    def _update_context(self, context_in, V, scores, index, L_Q):
+        B, H, L_V, D = V.shape
+        if self.training:
+            attn = torch.softmax(scores, dim=-1)
+            context_in[torch.arange(B)[:, None, None],
+                      torch.arange(H)[None, :, None],
+                      index, :] = torch.matmul(attn, V).type_as(context_in)
+            return (context_in, None)
+        else:
+            attn = torch.softmax(scores, dim=-1)
+            context_in[torch.arange(B)[:, None, None],
+                      torch.arange(H)[None, :, None],
+                      index, :] = torch.matmul(attn, V).type_as(context_in)
+            return (context_in, attn)
+    def forward(self, queries, keys, values, attn_mask=None):
+        B, L_Q, D = queries.shape
+        B, L_K, D = keys.shape
+        B, L_V, D = values.shape
+        H = self.n_heads
+        queries = self.w_q(queries).view(B, L_Q, H, -1).transpose(1, 2)
+        keys = self.w_k(keys).view(B, L_K, H, -1).transpose(1, 2)
+        values = self.w_v(values).view(B, L_V, H, -1).transpose(1, 2)
+        # math instead of numpy so the lengths stay Python ints under torch.jit.trace
+        U_part = self.factor * math.ceil(math.log(L_K))
+        u = self.factor * math.ceil(math.log(L_Q))
+        U_part = U_part if U_part < L_K else L_K
+        u = u if u < L_Q else L_Q
+        context = self._get_initial_context(values, L_Q)
+        if u > 0:
+            scores_top, index = self._prob_QK(queries, keys, sample_k=U_part, n_top=u)
+            context, attn = self._update_context(context, values, scores_top, index, L_Q)
+        out = context.transpose(1, 2).contiguous().view(B, L_Q, -1)
+        return self.w_o(out), attn
+
+class ConvLayer(nn.Module):
+    def __init__(self, c_in):
+        super().__init__()
+        self.downConv = nn.Conv1d(in_channels=c_in, out_channels=c_in, kernel_size=3, padding=2, padding_mode='circular')
+        self.norm = nn.BatchNorm1d(c_in)
+        self.activation = nn.ELU()
+        self.maxPool = nn.MaxPool1d(kernel_size=3, stride=2, padding=1)
+    def forward(self, x):
+        x = self.downConv(x.permute(0, 2, 1))
+        x = self.norm(x)
+        x = self.activation(x)
+        x = self.maxPool(x)
+        x = x.transpose(1, 2)
+        return x
+
+class InformerEncoderLayer(nn.Module):
+    def __init__(self, d_model, n_heads, d_ff=None, dropout=0.1, activation='relu'):
+        super().__init__()
+        d_ff = d_ff or 4 * d_model
+        self.attention = ProbSparseAttention(d_model, n_heads, dropout=dropout)
+        self.conv1 = nn.Conv1d(in_channels=d_model, out_channels=d_ff, kernel_size=1)
+        self.conv2 = nn.Conv1d(in_channels=d_ff, out_channels=d_model, kernel_size=1)
+        self.norm1 = nn.LayerNorm(d_model)
+        self.norm2 = nn.LayerNorm(d_model)
+        self.dropout = nn.Dropout(dropout)
+        self.activation = F.relu if activation == 'relu' else F.gelu
+    def forward(self, x, attn_mask=None):
+        new_x, attn = self.attention(x, x, x, attn_mask=attn_mask)
+        x = x + self.dropout(new_x)
+        x = self.norm1(x)
+        y = x
+        y = self.dropout(self.activation(self.conv1(y.transpose(-1, 1))))
+        y = self.dropout(self.conv2(y).transpose(-1, 1))
+        return self.norm2(x + y), attn
+
+class InformerEncoder(nn.Module):
+    def __init__(self, attn_layers, conv_layers=None, norm_layer=None):
+        super().__init__()
+        self.attn_layers = nn.ModuleList(attn_layers)
+        self.conv_layers = nn.ModuleList(conv_layers) if conv_layers is not None else None
+        self.norm = norm_layer
+    def forward(self, x, attn_mask=None):
+        attns = []
+        if self.conv_layers is not None:
+            for attn_layer, conv_layer in zip(self.attn_layers, self.conv_layers):
+                x, attn = attn_layer(x, attn_mask=attn_mask)
+                x = conv_layer(x)
+                attns.append(attn)
+            x, attn = self.attn_layers[-1](x)
+            attns.append(attn)
+        else:
+            for attn_layer in self.attn_layers:
+                x, attn = attn_layer(x, attn_mask=attn_mask)
+                attns.append(attn)
+        if self.norm is not None:
+            x = self.norm(x)
+        return x, attns
+
+class InformerModel(nn.Module):
+    def __init__(self, seq_len, n_features, d_model=512, n_heads=8, e_layers=2,
+                 d_ff=2048, dropout=0.05, activation='gelu', distil=True, output_attention=False):
+        super().__init__()
+        self.seq_len = seq_len
+        self.n_features = n_features
+        self.d_model = d_model
+        self.output_attention = output_attention
+        self.enc_embedding = nn.Linear(n_features, d_model)
+        self.position_encoding = PositionalEncoding(d_model)
+        self.dropout = nn.Dropout(dropout)
+        if distil:
+            self.encoder = InformerEncoder(
+                [InformerEncoderLayer(d_model, n_heads, d_ff, dropout, activation) for _ in range(e_layers)],
+                [ConvLayer(d_model) for _ in range(e_layers - 1)] if e_layers > 1 else None,
+                norm_layer=nn.LayerNorm(d_model)
+            )
+        else:
+            self.encoder = InformerEncoder(
+                [InformerEncoderLayer(d_model, n_heads, d_ff, dropout, activation) for _ in range(e_layers)],
+                norm_layer=nn.LayerNorm(d_model)
+            )
+        self.projection = nn.Sequential(
+            nn.Linear(d_model, d_model // 2),
+            nn.ReLU(),
+            nn.Dropout(dropout),
+            nn.Linear(d_model // 2, 1)
+        )
+    def forward(self, x_enc, enc_self_mask=None):
+        enc_out = self.enc_embedding(x_enc)
+        enc_out = self.position_encoding(enc_out)
+        enc_out = self.dropout(enc_out)
+        enc_out, attns = self.encoder(enc_out, attn_mask=enc_self_mask)
+        enc_out = enc_out.mean(dim=1)
+        output = self.projection(enc_out).squeeze(-1)
+        if self.output_attention:
+            return output, attns
+        else:
+            return output
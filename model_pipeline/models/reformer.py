@@ -0,0 +1,107 @@
+"""Reformer with chunked LSH-style attention and reversible blocks (from Reformer.ipynb)."""
+import math
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class SinusoidalPositionalEncoding(nn.Module):
+    def __init__(self, d_model, max_len=10000):
+        super().__init__()
+        pe = torch.zeros(max_len, d_model)
+        position = torch.arange(0, max_len).unsqueeze(1)
+        div_term = torch.exp(torch.arange(0, d_model, 2) * (-np.log(10000.0) / d_model))
+        pe[:, 0::2] = torch.sin(position * div_term)
+        pe[:, 1::2] = torch.cos(position * div_term)
+        pe = pe.unsqueeze(0)
+        self.register_buffer('pe', pe)
+    def forward(self, x):
+        return x + self.pe[:, :x.size(1), :]
+
+class LSHSelfAttention(nn.Module):
+    def __init__(self, d_model, n_heads, bucket_size=16, dropout=0.1):
+        super().__init__()
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.bucket_size = bucket_size
+        self.head_dim = d_model // n_heads
+        self.to_qk = nn.Linear(d_model, d_model, bias=False)
+        self.to_v = nn.Linear(d_model, d_model, bias=False)
+        self.to_out = nn.Linear(d_model, d_model)
+        self.dropout = nn.Dropout(dropout)
+    def forward(self, x):
+        B, S, _ = x.shape
+        QK = self.to_qk(x).view(B, S, self.n_heads, self.head_dim).transpose(1, 2)
+        V = self.to_v(x).view(B, S, self.n_heads, self.head_dim).transpose(1, 2)
+        if S < self.bucket_size:
+            scores = torch.matmul(QK, QK.transpose(-2, -1)) / math.sqrt(self.head_dim)
+            attn = torch.softmax(scores, dim=-1)
+            attn = self.dropout(attn)
+            out = torch.matmul(attn, V)
+        else:
+            n_chunks = S // self.bucket_size
+            if S % self.bucket_size != 0:
+                n_chunks += 1
+            outs = []
+            for i in range(n_chunks):
+                start = i * self.bucket_size
+                end = min((i + 1) * self.bucket_size, S)
+                q_chunk = QK[:, :, start:end, :]
+                v_chunk = V[:, :, start:end, :]
+                scores = torch.matmul(q_chunk, q_chunk.transpose(-2, -1)) / math.sqrt(self.head_dim)
+                attn = torch.softmax(scores, dim=-1)
+                attn = self.dropout(attn)
+                chunk_out = torch.matmul(attn, v_chunk)
+                outs.append(chunk_out)
+            out = torch.cat(outs, dim=2)
+        out = out.transpose(1,2).contiguous().view(B, S, self.d_model)
+        return self.to_out(out)
+
+class ReversibleBlock(nn.Module):
+    def __init__(self, d_model, n_heads, dropout=0.1):
+        super().__init__()
+        self.attn = LSHSelfAttention(d_model // 2, n_heads, dropout=dropout)
+        self.ff = nn.Sequential(
+            nn.Linear(d_model // 2, (d_model // 2) * 4),
+            nn.GELU(),
+            nn.Dropout(dropout),
+            nn.Linear((d_model // 2) * 4, d_model // 2)
+        )
+        self.norm1 = nn.LayerNorm(d_model // 2)
+        self.norm2 = nn.LayerNorm(d_model // 2)
+    def forward(self, x):
+        x1, x2 = x.chunk(2, dim=-1)
+        y1 = x1 + self.attn(self.norm1(x2))
+        y2 = x2 + self.ff(self.norm2(y1))
+        return torch.cat([y1, y2], dim=-1)
+
+class Reformer(nn.Module):
+    def __init__(self, seq_len, n_features, d_model=128, n_heads=4, n_layers=6, bucket_size=16, dropout=0.1, out_dim=1):
+        super().__init__()
+        self.input_proj = nn.Linear(n_features, d_model)
+        self.pos_enc = SinusoidalPositionalEncoding(d_model, max_len=seq_len)
+        self.blocks = nn.ModuleList([
+            ReversibleBlock(d_model, n_heads, dropout=dropout)
+            for _ in range(n_layers)
+        ])
+        self.norm = nn.LayerNorm(d_model)
+        self.global_pool = nn.AdaptiveAvgPool1d(1)
+        self.fc = nn.Sequential(
+            nn.Linear(d_model, d_model//2),
+            nn.GELU(),
+            nn.Dropout(dropout),
+            nn.Linear(d_model//2, out_dim)
+        )
+    def forward(self, x):
+        x = self.input_proj(x)
+        x = self.pos_enc(x)
+        if x.shape[-1] % 2 != 0:
+            x = F.pad(x, (0,1))
+        for block in self.blocks:
+            x = block(x)
+        x = self.norm(x)
+        x = x.transpose(1,2)
+        x = self.global_pool(x).squeeze(-1)
+        out = self.fc(x).squeeze(-1)
+        return out
@@ -0,0 +1,40 @@
+"""Simplified Temporal Fusion Transformer (from TFT.ipynb)."""
+import torch.nn as nn
+
+
+class GatedResidualNetwork(nn.Module):
+    def __init__(self, input_dim, hidden_dim, output_dim, dropout=0.1):
+        super().__init__()
+        self.fc1 = nn.Linear(input_dim, hidden_dim)
+        self.elu = nn.ELU()
+        self.fc2 = nn.Linear(hidden_dim, output_dim)
+        self.dropout = nn.Dropout(dropout)
+        self.gate = nn.Linear(output_dim, output_dim)
+        self.sigmoid = nn.Sigmoid()
+        self.norm = nn.LayerNorm(output_dim)
+        self.skip_proj = nn.Linear(input_dim, output_dim) if input_dim != output_dim else None
+    def forward(self, x):
+        residual = x if self.skip_proj is None else self.skip_proj(x)
+        x = self.fc1(x)
+        x = self.elu(x)
+        x = self.fc2(x)
+        x = self.dropout(x)
+        gate = self.sigmoid(self.gate(x))
+        x = gate * x + (1 - gate) * residual
+        return self.norm(x)
+
+class SimpleTFT(nn.Module):
+    def __init__(self, n_features, hidden_size=64, output_size=1, num_layers=1, dropout=0.1):
+        super().__init__()
+        self.embedding = nn.Linear(n_features, hidden_size)
+        self.encoder = nn.LSTM(hidden_size, hidden_size, num_layers, batch_first=True, dropout=dropout)
+        self.grn = GatedResidualNetwork(hidden_size, hidden_size, hidden_size, dropout)
+        self.attention = nn.MultiheadAttention(hidden_size, num_heads=4, dropout=dropout, batch_first=True)
+        self.head = nn.Linear(hidden_size, output_size)
+    def forward(self, x):
+        x = self.embedding(x)
+        enc_out, _ = self.encoder(x)
+        grn_out = self.grn(enc_out)
+        attn_out, _ = self.attention(grn_out, grn_out, grn_out)
+        pooled = attn_out.mean(dim=1)
+        return self.head(pooled).squeeze(-1)
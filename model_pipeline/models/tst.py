@@ -0,0 +1,68 @@
+"""Time Series Transformer with per-layer attention weights (from TST.ipynb)."""
+import math
+import torch
+import torch.nn as nn
+
+
+class PositionalEncoding(nn.Module):
+    def __init__(self, d_model, max_len=500):
+        super().__init__()
+        pe = torch.zeros(max_len, d_model)
+        position = torch.arange(0, max_len, dtype=torch.float).unsqueeze(1)
+        div_term = torch.exp(torch.arange(0, d_model, 2).float() * (-math.log(10000.0) / d_model))
+        pe[:, 0::2] = torch.sin(position * div_term)
+        pe[:, 1::2] = torch.cos(position * div_term)
+        self.register_buffer('pe', pe.unsqueeze(0))
+    def forward(self, x):
+        seq_len = x.size(1)
+        return x + self.pe[:, :seq_len, :].to(x.device)
+
+class TSTEncoderLayer(nn.Module):
+    def __init__(self, d_model, n_heads, d_ff, dropout=0.1):
+        super().__init__()
+        self.self_attn = nn.MultiheadAttention(d_model, n_heads, dropout=dropout, batch_first=True)
+        self.linear1 = nn.Linear(d_model, d_ff)
+        self.dropout = nn.Dropout(dropout)
+        self.linear2 = nn.Linear(d_ff, d_model)
+        self.norm1 = nn.LayerNorm(d_model)
+        self.norm2 = nn.LayerNorm(d_model)
+        self.dropout1 = nn.Dropout(dropout)
+        self.dropout2 = nn.Dropout(dropout)
+        self.activation = nn.GELU()
+    def forward(self, src):
+        src2, attn_weights = self.self_attn(src, src, src)
+        src = src + self.dropout1(src2)
+        src = self.norm1(src)
+        src2 = self.linear2(self.dropout(self.activation(self.linear1(src))))
+        src = src + self.dropout2(src2)
+        src = self.norm2(src)
+        return src, attn_weights
+
+class EnhancedTST(nn.Module):
+    def __init__(self, n_features, d_model=128, n_heads=8, num_layers=3, d_ff=256, output_size=1, dropout=0.2, max_len=100):
+        super().__init__()
+        self.d_model = d_model
+        self.n_features = n_features
+        self.input_proj = nn.Linear(n_features, d_model)
+        self.pos_encoder = PositionalEncoding(d_model, max_len)
+        self.encoder_layers = nn.ModuleList([
+            TSTEncoderLayer(d_model, n_heads, d_ff, dropout)
+            for _ in range(num_layers)
+        ])
+        self.flatten = nn.Flatten()
+        self.output_layer = nn.Sequential(
+            nn.Linear(d_model * max_len, 128),
+            nn.GELU(),
+            nn.Dropout(dropout),
+            nn.Linear(128, output_size)
+        )
+    def forward(self, x):
+        x = self.input_proj(x)  # [batch, seq_len, d_model]
+        x = self.pos_encoder(x)
+        attn_weights = []
+        for layer in self.encoder_layers:
+            x, attn = layer(x)
+            attn_weights.append(attn)
+        x = self.flatten(x)
+        out = self.output_layer(x)
+        return out.squeeze(-1), attn_weights
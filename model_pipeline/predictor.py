@@ -0,0 +1,215 @@
+"""Packaged market-value predictor: weights, feature order and scalers in one file.
+
+A bundle is written with `MarketValuePredictor.save()` (e.g. by
+`python -m model_pipeline.benchmark --save-dir models/`) and holds plain
+tensors and lists only, so it loads with `torch.load(weights_only=True)`.
+Scoring is vectorized: the scaling, the forward pass and the inverse scaling
+run on whole batches, so one player and a few thousand windows cost one call.
+
+    python -m model_pipeline.predictor models/tft.pt --player "Bukayo Saka"
+    python -m model_pipeline.predictor models/tft.pt --csv test.csv --out predictions.csv
+
+TorchScript bundles from `model_pipeline.export` (`.ts`, optionally int8)
+load through the same `MarketValuePredictor.load()`.
+"""
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+import torch
+
+from model_pipeline.models import build_model
+from model_pipeline.training import configure_threads, forward
+from model_pipeline.dataset_store import TARGET_COLUMN
+from model_pipeline.windows import SEQ_LEN, build_windows
+
+PREDICT_BATCH_SIZE = 4096
+TORCHSCRIPT_SUFFIX = ".ts"
+# Scalers and feature order travel inside the TorchScript archive under this name
+TORCHSCRIPT_CONFIG = "predictor.json"
+
+
+class MarketValuePredictor:
+    """Scores flat `ordered_cols` rows, wide-layout frames or player windows in euros."""
+
+    def __init__(self, model, model_name, features, scaler_mean, scaler_scale, target_mean, target_scale,
+                 seq_len=SEQ_LEN, metadata=None, model_params=None):
+        self.model = model.eval()
+        self.model_name = model_name
+        # build_model() overrides the model was trained with (empty for the notebook defaults)
+        self.model_params = dict(model_params or {})
+        self.features = list(features)
+        self.seq_len = seq_len
+        self.ordered_cols = [f"{f}_t{i}" for i in range(1, seq_len + 1) for f in self.features]
+        self.x_mean = torch.as_tensor(scaler_mean, dtype=torch.float32)
+        self.x_scale = torch.as_tensor(scaler_scale, dtype=torch.float32)
+        self.y_mean = float(target_mean)
+        self.y_scale = float(target_scale)
+        self.metadata = dict(metadata or {})
+
+    @property
+    def n_features(self):
+        return len(self.features)
+
+    @classmethod
+    def from_training(cls, model, model_name, data, metadata=None, model_params=None):
+        """Bundle a trained model with the scalers of a `training.PreparedData`."""
+        return cls(model, model_name, data.features, data.scaler_X.mean_, data.scaler_X.scale_,
+                   data.scaler_y.mean_[0], data.scaler_y.scale_[0], seq_len=data.seq_len, metadata=metadata,
+                   model_params=model_params)
+
+    def config(self):
+        """Everything but the weights: model name, feature order and scaler statistics."""
+        return {
+            "model_name": self.model_name,
+            "model_params": self.model_params,
+            "features": self.features,
+            "seq_len": self.seq_len,
+            "x_mean": self.x_mean.tolist(),
+            "x_scale": self.x_scale.tolist(),
+            "y_mean": self.y_mean,
+            "y_scale": self.y_scale,
+            "metadata": self.metadata,
+        }
+
+    def with_model(self, model, **metadata):
+        """Same scalers and features around another model, e.g. a traced or quantized copy."""
+        config = self.config()
+        return MarketValuePredictor(model, config["model_name"], config["features"], config["x_mean"],
+                                    config["x_scale"], config["y_mean"], config["y_scale"], seq_len=config["seq_len"],
+                                    metadata={**config["metadata"], **metadata}, model_params=config["model_params"])
+
+    def save(self, path):
+        torch.save({**self.config(), "state_dict": self.model.state_dict()}, path)
+
+    @classmethod
+    def load(cls, path, map_location="cpu"):
+        if str(path).endswith(TORCHSCRIPT_SUFFIX):
+            extra_files = {TORCHSCRIPT_CONFIG: ""}
+            model = torch.jit.load(path, map_location=map_location, _extra_files=extra_files)
+            bundle = json.loads(extra_files[TORCHSCRIPT_CONFIG])
+        else:
+            bundle = torch.load(path, map_location=map_location, weights_only=True)
+            model = build_model(bundle["model_name"], len(bundle["features"]), bundle["seq_len"],
+                                **bundle.get("model_params", {}))
+            model.load_state_dict(bundle["state_dict"])
+        predictor = cls(model, bundle["model_name"], bundle["features"], bundle["x_mean"], bundle["x_scale"],
+                        bundle["y_mean"], bundle["y_scale"], seq_len=bundle["seq_len"], metadata=bundle["metadata"],
+                        model_params=bundle.get("model_params"))
+        if isinstance(model, torch.jit.ScriptModule):
+            # The JIT optimizes the graph during the first calls; pay that here, not on the first request
+            for _ in range(2):
+                predictor.predict_scaled(torch.zeros(1, predictor.seq_len, predictor.n_features))
+        return predictor
+
+    def transform(self, X):
+        """Scaled `(N, seq_len, n_features)` model input; NaN/inf count as 0 like in training."""
+        X = torch.tensor(np.asarray(X, dtype=np.float32))
+        X = torch.nan_to_num(X.reshape(len(X), -1), nan=0.0, posinf=0.0, neginf=0.0)
+        if X.shape[1] != len(self.ordered_cols):
+            raise ValueError(f"Expected {len(self.ordered_cols)} values per window, got {X.shape[1]}")
+        return ((X - self.x_mean) / self.x_scale).view(len(X), self.seq_len, self.n_features)
+
+    def predict_scaled(self, X, batch_size=PREDICT_BATCH_SIZE):
+        """Raw model outputs (standardized target) for already scaled inputs."""
+        out = torch.empty(len(X))
+        with torch.inference_mode():
+            for start in range(0, len(X), batch_size):
+                out[start:start + batch_size] = forward(self.model, X[start:start + batch_size]).reshape(-1)
+        return out.numpy()
+
+    def inverse_y(self, y):
+        return np.asarray(y, dtype=np.float64) * self.y_scale + self.y_mean
+
+    def predict(self, X, batch_size=PREDICT_BATCH_SIZE):
+        """Market values for `(N, seq_len * n_features)` or `(N, seq_len, n_features)` inputs."""
+        return self.inverse_y(self.predict_scaled(self.transform(X), batch_size))
+
+    def frame_array(self, df):
+        """Wide models_dataset layout (`<feature>_t1..t5` columns) in `ordered_cols` order; other columns are ignored."""
+        missing = [col for col in self.ordered_cols if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing {len(missing)} feature columns, e.g. {missing[:5]}")
+        return df[self.ordered_cols].to_numpy(dtype=np.float32)
+
+    def records_array(self, records):
+        """Records (e.g. a JSON request) with every `ordered_cols` key.
+
+        The other models_dataset columns (ids, date, past and current targets)
+        are allowed and ignored; any other key or a null feature is rejected,
+        so a misspelled feature is an error instead of a silent 0.
+        """
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise TypeError("Expected a list of objects keyed by feature column")
+        expected = set(self.ordered_cols)
+        allowed = expected | {"Oyuncu_ID", "Date", "target"} | {f"{TARGET_COLUMN}_t{t}" for t in range(1, self.seq_len + 1)}
+        for i, record in enumerate(records):
+            unknown = sorted(set(record) - allowed)
+            if unknown:
+                raise ValueError(f"Row {i}: unknown feature columns {unknown[:5]}")
+            missing = [col for col in self.ordered_cols if col not in record]
+            if missing:
+                raise ValueError(f"Row {i}: missing {len(missing)} feature columns, e.g. {missing[:5]}")
+            empty = [col for col in self.ordered_cols if record[col] is None]
+            if empty:
+                raise ValueError(f"Row {i}: null values for {empty[:5]}")
+        return self.frame_array(pd.DataFrame.from_records(records, columns=self.ordered_cols))
+
+    def predict_frame(self, df):
+        return self.predict(self.frame_array(df))
+
+    def player_windows(self, windows, players):
+        """Latest window of each player in a `windows.WindowSet`, flattened in `ordered_cols` order."""
+        if windows.feature_names != self.features or windows.seq_len != self.seq_len:
+            raise ValueError("Window features do not match the ones the model was trained on")
+        if not isinstance(players, (list, tuple)) or not all(isinstance(player, str) for player in players):
+            raise TypeError("Expected a list of player names")
+        codes = {name: code for code, name in enumerate(windows.player_names)}
+        owners = windows.oyuncu_ids
+        latest = []
+        for player in players:
+            if player not in codes:
+                raise KeyError(f"Unknown player: {player}")
+            positions = np.flatnonzero(owners == codes[player])
+            if not len(positions):
+                raise KeyError(f"{player} has fewer than {self.seq_len} seasons")
+            latest.append(positions[-1])
+        return windows.take(np.array(latest, dtype=np.int64)).reshape(len(latest), -1)
+
+    def predict_players(self, windows, players):
+        return self.predict(self.player_windows(windows, players))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundle", help="Predictor bundle written by MarketValuePredictor.save()")
+    parser.add_argument("--player", nargs="+", default=None, help="Score the latest window of these players")
+    parser.add_argument("--csv", default=None, help="Score every row of a wide-layout CSV")
+    parser.add_argument("--out", default=None, help="Write the CSV predictions here instead of printing them")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    if not (args.player or args.csv):
+        parser.error("give --player or --csv")
+
+    configure_threads(args.threads)
+    predictor = MarketValuePredictor.load(args.bundle)
+    if args.player:
+        windows = build_windows(seq_len=predictor.seq_len)
+        start = time.perf_counter()
+        values = predictor.predict_players(windows, args.player)
+        elapsed = (time.perf_counter() - start) * 1000
+        for player, value in zip(args.player, values):
+            print(f"💰 {player}: €{value:,.0f}")
+        print(f"⏱️ {elapsed:.2f} ms")
+    if args.csv:
+        df = pd.read_csv(args.csv)
+        start = time.perf_counter()
+        df["prediction"] = predictor.predict_frame(df)
+        elapsed = time.perf_counter() - start
+        print(f"✅ {len(df)} rows scored in {elapsed * 1000:.1f} ms")
+        if args.out:
+            df.to_csv(args.out, index=False)
+            print(f"Predictions → {args.out}")
+        else:
+            print(df["prediction"].to_string())
@@ -0,0 +1,187 @@
+"""Local HTTP endpoint for a predictor bundle, with request micro-batching.
+
+Concurrent requests are queued and scored together: the worker takes the
+first waiting request, collects whatever else arrives within `--max-wait-ms`
+(up to `--max-batch` windows) and runs one vectorized forward pass for all
+of them. Example:
+
+    python -m model_pipeline.serve models/tft.pt --port 8000 --players
+    curl -s localhost:8000/predict -d '{"players": ["Bukayo Saka"]}'
+
+POST /predict accepts one of
+    {"players": ["name", ...]}                      latest window from data/dataset.csv (needs --players)
+    {"rows": [{"Yaş_t1": 21, ...}, ...]}             wide-layout records with every ordered_cols key
+    {"instances": [[...seq_len * n_features...]]}   already ordered values
+and answers {"predictions": [...], "model": ..., "ms": ...}. GET /health reports the bundle.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+from model_pipeline.predictor import MarketValuePredictor
+from model_pipeline.training import configure_threads
+from model_pipeline.windows import build_windows
+
+REQUEST_TIMEOUT_SECONDS = 30
+
+
+class PredictServer(ThreadingHTTPServer):
+    # The socketserver default backlog of 5 resets connections under bursts of concurrent scouts
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class MicroBatcher:
+    """Coalesces concurrent `submit()` calls into single `predict_fn` calls on one worker thread."""
+
+    def __init__(self, predict_fn, max_batch=512, max_wait_ms=2.0):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.requests = 0
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, X):
+        future = Future()
+        self.queue.put((np.asarray(X, dtype=np.float32), future))
+        return future
+
+    def close(self):
+        self.queue.put(None)
+        self.worker.join()
+
+    def _collect(self, first):
+        items, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Keep the stop signal for the main loop
+                self.queue.put(None)
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        while True:
+            first = self.queue.get()
+            if first is None:
+                return
+            items = self._collect(first)
+            try:
+                predictions = self.predict_fn(np.concatenate([X for X, _ in items]))
+            except Exception:
+                # Score the requests one by one so a bad one only fails itself
+                self._run_each(items)
+                continue
+            self.batches += 1
+            self.requests += len(items)
+            offset = 0
+            for X, future in items:
+                future.set_result(predictions[offset:offset + len(X)])
+                offset += len(X)
+
+    def _run_each(self, items):
+        for X, future in items:
+            try:
+                future.set_result(self.predict_fn(X))
+            except Exception as e:
+                future.set_exception(e)
+            self.batches += 1
+            self.requests += 1
+
+
+def make_handler(predictor, batcher, windows=None):
+    class PredictHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Per-request access logs would dominate the latency at this scale
+            pass
+
+        def do_GET(self):
+            if self.path != "/health":
+                return self._send(404, {"error": "not found"})
+            self._send(200, {"model": predictor.model_name, "features": predictor.n_features,
+                             "seq_len": predictor.seq_len, "players": windows is not None,
+                             "batches": batcher.batches, "requests": batcher.requests})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                return self._send(404, {"error": "not found"})
+            start = time.perf_counter()
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if "players" in payload:
+                    if windows is None:
+                        return self._send(400, {"error": "start the server with --players to score by name"})
+                    X = predictor.player_windows(windows, payload["players"])
+                elif "rows" in payload:
+                    X = predictor.records_array(payload["rows"])
+                elif "instances" in payload:
+                    X = np.asarray(payload["instances"], dtype=np.float32).reshape(len(payload["instances"]), -1)
+                else:
+                    return self._send(400, {"error": "expected 'players', 'rows' or 'instances'"})
+                if not len(X):
+                    raise ValueError("Nothing to predict")
+                if X.ndim != 2 or X.shape[1] != len(predictor.ordered_cols):
+                    raise ValueError(f"Expected {len(predictor.ordered_cols)} values per instance, "
+                                     f"got {X.shape[1] if X.ndim == 2 else X.shape}")
+            except (KeyError, ValueError, TypeError) as e:
+                # KeyError's str() adds quotes around the message
+                return self._send(400, {"error": str(e.args[0]) if e.args else str(e)})
+            try:
+                predictions = batcher.submit(X).result(timeout=REQUEST_TIMEOUT_SECONDS)
+            except Exception as e:
+                return self._send(500, {"error": str(e)})
+            self._send(200, {"predictions": predictions.tolist(), "model": predictor.model_name,
+                             "ms": (time.perf_counter() - start) * 1000})
+
+    return PredictHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("bundle", help="Predictor bundle written by MarketValuePredictor.save()")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--players", action="store_true", help="Load data/dataset.csv windows to score players by name")
+    parser.add_argument("--max-batch", type=int, default=512, help="Most windows scored in one forward pass")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="How long a request waits for others to join")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    configure_threads(args.threads)
+    predictor = MarketValuePredictor.load(args.bundle)
+    windows = build_windows(seq_len=predictor.seq_len) if args.players else None
+    batcher = MicroBatcher(predictor.predict, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    server = PredictServer((args.host, args.port), make_handler(predictor, batcher, windows))
+    print(f"🚀 Serving {predictor.model_name} on http://{args.host}:{args.port} (POST /predict, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
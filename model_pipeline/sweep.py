@@ -0,0 +1,224 @@
+"""Parallel hyperparameter sweep for one architecture.
+
+Trials are spread over a process pool. Every worker pins its torch thread
+count and loads the prepared (feature-selected, scaled) arrays once from an
+.npz cache, so no trial parses CSVs or refits scalers. A median pruner stops
+a trial whose best validation loss so far is worse than the median of the
+other trials at the same epoch. Example:
+
+    python -m model_pipeline.sweep informer --grid d_model=64,128 e_layers=2,3 dropout=0.1,0.3 lr=1e-4,3e-4 \\
+        --workers 4 --threads 1 --csv output/sweep_informer.csv
+
+Grid keys are build_model() arguments (see MODEL_DEFAULTS) or the training
+settings lr, weight_decay, batch_size and patience.
+"""
+import argparse
+import itertools
+import multiprocessing as mp
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+
+from model_pipeline.benchmark import build_optimizer
+from model_pipeline.dataset import make_loaders
+from model_pipeline.models import MODEL_DEFAULTS, MODELS, build_model
+from model_pipeline.predictor import MarketValuePredictor
+from model_pipeline.training import (
+    PreparedData, cached_prepared_data, configure_threads, evaluate, set_seed, train_model,
+)
+
+TRAINING_PARAMS = {"lr": 1e-4, "weight_decay": 1e-5, "batch_size": 32, "patience": 15}
+DEFAULT_CACHE_DIR = os.path.join("output", "cache")
+
+# Set once per worker process by init_worker()
+_worker = {}
+
+
+def parse_value(text):
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_grid(items):
+    """["d_model=64,128", "lr=1e-4"] → {"d_model": [64, 128], "lr": [0.0001]}"""
+    grid = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        if not values:
+            raise ValueError(f"Expected key=v1,v2,... but got {item!r}")
+        grid[key.strip()] = [parse_value(v.strip()) for v in values.split(",")]
+    return grid
+
+
+def expand_grid(grid, n_trials=None, seed=0):
+    """Every combination, or `n_trials` of them drawn without replacement."""
+    keys = list(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    if n_trials and n_trials < len(combos):
+        combos = random.Random(seed).sample(combos, n_trials)
+    return combos
+
+
+class MedianPruner:
+    """Prunes when a trial's best validation loss is above the median of the other trials at that epoch.
+
+    `curves` is shared between the workers (a Manager dict of trial → per-epoch
+    validation losses). Every trial publishes its curve after each epoch, so
+    trials running at the same time can prune each other; a trial that is
+    ahead is compared with the others' best loss up to where they are.
+    """
+
+    def __init__(self, curves, trial, warmup_epochs=5, min_trials=3):
+        self.curves = curves
+        self.trial = trial
+        self.warmup_epochs = warmup_epochs
+        self.min_trials = min_trials
+
+    def __call__(self, epoch, val_losses):
+        self.curves[self.trial] = list(val_losses)
+        if epoch < self.warmup_epochs:
+            return False
+        # Trials that are still behind count with their best so far, which only makes pruning more lenient
+        others = [min(curve[:epoch]) for trial, curve in self.curves.items()
+                  if trial != self.trial and len(curve) >= self.warmup_epochs]
+        if len(others) < self.min_trials:
+            return False
+        return min(val_losses) > float(np.median(others))
+
+
+def init_worker(cache_path, threads, curves):
+    configure_threads(threads)
+    _worker["data"] = PreparedData.load(cache_path)
+    _worker["curves"] = curves
+
+
+def run_trial(trial, model_name, params, settings):
+    data = _worker["data"]
+    model_params = {k: v for k, v in params.items() if k not in TRAINING_PARAMS}
+    training = {**TRAINING_PARAMS, **settings["training"], **{k: v for k, v in params.items() if k in TRAINING_PARAMS}}
+    row = {"trial": trial, **params}
+    start = time.perf_counter()
+    try:
+        set_seed(settings["seed"])
+        train_loader, val_loader, _ = make_loaders(*data.arrays(), seq_len=data.seq_len, n_features=data.n_features,
+                                                   batch_size=int(training["batch_size"]), seed=settings["seed"])
+        model = build_model(model_name, data.n_features, data.seq_len, **model_params)
+        optimizer, scheduler, scheduler_step = build_optimizer(model_name, model, len(train_loader),
+                                                               settings["epochs"], lr=training["lr"],
+                                                               weight_decay=training["weight_decay"])
+        pruner = MedianPruner(_worker["curves"], trial, settings["warmup_epochs"], settings["min_trials"]) \
+            if settings["prune"] else None
+        history = train_model(model, train_loader, val_loader, optimizer, scheduler, scheduler_step,
+                              epochs=settings["epochs"], patience=int(training["patience"]), log_every=0,
+                              should_stop=pruner)
+    except Exception as e:
+        # A bad combination (e.g. d_model not divisible by n_heads) fails only its own trial
+        return {**row, "status": "failed", "error": str(e), "train_s": time.perf_counter() - start}
+
+    _worker["curves"][trial] = history["val_losses"]
+    val = evaluate(model, val_loader, data)
+    row.update({
+        "status": "pruned" if history["pruned"] else "complete",
+        "best_val_loss": history["best_val_loss"],
+        "best_epoch": history["best_epoch"],
+        "epochs": history["epochs_run"],
+        "val_MAE": val["MAE"],
+        "val_R2": val["R2"],
+        "train_s": time.perf_counter() - start,
+    })
+    if settings["save_dir"] and not history["pruned"]:
+        path = os.path.join(settings["save_dir"], f"{model_name}_trial{trial:03d}.pt")
+        MarketValuePredictor.from_training(model, model_name, data, metadata={"trial": trial, "params": params},
+                                           model_params=model_params).save(path)
+        row["bundle"] = path
+    return row
+
+
+def run_sweep(model_name, trials, cache_path, workers=None, threads=1, seed=42, epochs=100, prune=True,
+              warmup_epochs=5, min_trials=3, training=None, save_dir=None):
+    """Run every trial config on `workers` processes; returns the results sorted by validation loss."""
+    workers = workers or max(1, (os.cpu_count() or 1) // threads)
+    settings = {"seed": seed, "epochs": epochs, "prune": prune, "warmup_epochs": warmup_epochs,
+                "min_trials": min_trials, "training": dict(training or {}), "save_dir": save_dir}
+    if save_dir:
+        os.makedirs(save_dir, exist_ok=True)
+    ctx = mp.get_context("spawn")
+    rows = []
+    with ctx.Manager() as manager:
+        curves = manager.dict()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=init_worker,
+                                 initargs=(cache_path, threads, curves)) as pool:
+            futures = [pool.submit(run_trial, i, model_name, params, settings) for i, params in enumerate(trials)]
+            for future in as_completed(futures):
+                row = future.result()
+                rows.append(row)
+                shown = ", ".join(f"{k}={row[k]}" for k in trials[row["trial"]])
+                if row["status"] == "failed":
+                    print(f"❌ Trial {row['trial']} ({shown}) failed: {row['error']}")
+                else:
+                    print(f"{'✂️' if row['status'] == 'pruned' else '✅'} Trial {row['trial']} ({shown}): "
+                          f"val loss {row['best_val_loss']:.4f} after {row['epochs']} epochs, {row['train_s']:.1f}s")
+    results = pd.DataFrame(rows)
+    if "best_val_loss" not in results:
+        # Every trial failed
+        return results
+    return results.sort_values("best_val_loss", na_position="last").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model", choices=MODELS)
+    parser.add_argument("--grid", nargs="+", default=[], help="key=v1,v2,... (model or training parameters)")
+    parser.add_argument("--trials", type=int, default=None, help="Random subset of the grid to run")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: cores / threads)")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads pinned in every worker")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--patience", type=int, default=TRAINING_PARAMS["patience"])
+    parser.add_argument("--batch-size", type=int, default=TRAINING_PARAMS["batch_size"])
+    parser.add_argument("--no-prune", action="store_true", help="Train every trial until early stopping")
+    parser.add_argument("--warmup-epochs", type=int, default=5, help="Epochs before a trial can be pruned")
+    parser.add_argument("--min-trials", type=int, default=3, help="Trials needed at an epoch before pruning there")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--train", default=None, help="Train CSV in the models_dataset layout (needs --val and --test)")
+    parser.add_argument("--val", default=None)
+    parser.add_argument("--test", default=None)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Where the prepared arrays are cached")
+    parser.add_argument("--save-dir", default=None, help="Save a predictor bundle for every completed trial")
+    parser.add_argument("--csv", default=None, help="Also write the results to this CSV")
+    args = parser.parse_args()
+    if args.train and not (args.val and args.test):
+        parser.error("--train needs --val and --test")
+
+    try:
+        grid = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+    unknown = set(grid) - set(MODEL_DEFAULTS[args.model]) - set(TRAINING_PARAMS)
+    if unknown:
+        parser.error(f"unknown parameters for {args.model}: {', '.join(sorted(unknown))}")
+    trials = expand_grid(grid, args.trials, seed=args.seed)
+
+    start = time.perf_counter()
+    data, cache_path = cached_prepared_data(args.cache_dir, args.train, args.val, args.test, seed=args.seed)
+    print(f"✅ Prepared arrays in {time.perf_counter() - start:.2f}s → {cache_path}")
+    print(f"🔎 {len(trials)} trials of {args.model}")
+    start = time.perf_counter()
+    results = run_sweep(args.model, trials, cache_path, workers=args.workers, threads=args.threads, seed=args.seed,
+                        epochs=args.epochs, prune=not args.no_prune, warmup_epochs=args.warmup_epochs,
+                        min_trials=args.min_trials, save_dir=args.save_dir,
+                        training={"patience": args.patience, "batch_size": args.batch_size})
+    print(f"\n⏱️ Sweep finished in {time.perf_counter() - start:.1f}s")
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.float_format", "{:,.4g}".format):
+        print(results.drop(columns=[c for c in ("bundle", "error") if c in results]).to_string(index=False))
+    if args.csv:
+        results.to_csv(args.csv, index=False)
+        print(f"Results → {args.csv}")
@@ -0,0 +1,343 @@
+"""Training engine shared by the model notebooks and the benchmark.
+
+The TFT, TST, Informer, Autoformer and Reformer notebooks each carry their
+own copy of the feature selection (`prepare_X_y`), `EarlyStopping`,
+`safe_mape` and the 100-epoch loop. This module holds one version of each
+so every architecture is trained and scored the same way: MSE loss,
+gradient clipping at 1.0, best-validation weights restored before testing
+and metrics computed on the inverse-scaled target.
+"""
+import copy
+import hashlib
+import json
+import os
+import random
+import resource
+import sys
+import time
+import numpy as np
+import pandas as pd
+import torch
+import torch.nn as nn
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.preprocessing import StandardScaler
+
+from model_pipeline.dataset_store import DATASET_CSV
+from model_pipeline.windows import SEQ_LEN, build_windows
+
+TARGET_COL = "target"
+ID_COLS = ["Oyuncu_ID", "Date"]
+LATENCY_PERCENTILES = (50, 95, 99)
+
+
+# ---- Data -----------------------------------------------------------------
+
+def common_features(df, seq_len=SEQ_LEN, target_col=TARGET_COL, id_cols=ID_COLS):
+    """Base feature names present for every season `_t1.._t{seq_len}`, sorted."""
+    feature_cols = [c for c in df.columns if c not in [target_col] + id_cols]
+    feature_sets = [{c[:-len(f"_t{i}")] for c in feature_cols if c.endswith(f"_t{i}")}
+                    for i in range(1, seq_len + 1)]
+    return sorted(set.intersection(*feature_sets))
+
+
+def ordered_columns(features, seq_len=SEQ_LEN):
+    # Season-major: every feature of t1, then every feature of t2, ...
+    return [f"{f}_t{i}" for i in range(1, seq_len + 1) for f in features]
+
+
+def prepare_X_y(df, ordered_cols, target_col=TARGET_COL):
+    """Flat `(N, seq_len * n_features)` inputs and targets with NaN/inf set to 0."""
+    X = np.nan_to_num(df[ordered_cols].to_numpy(dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+    y = np.nan_to_num(df[target_col].to_numpy(dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+    return X, y
+
+
+def split_by_player(df, val_frac=0.15, test_frac=0.15, seed=42, id_col="Oyuncu_ID"):
+    """Train/val/test frames with every player's windows kept in a single split."""
+    players = np.sort(df[id_col].unique())
+    np.random.default_rng(seed).shuffle(players)
+    n_test = int(round(len(players) * test_frac))
+    n_val = int(round(len(players) * val_frac))
+    test_ids, val_ids = set(players[:n_test]), set(players[n_test:n_test + n_val])
+    in_test, in_val = df[id_col].isin(test_ids), df[id_col].isin(val_ids)
+    return df[~in_test & ~in_val], df[in_val], df[in_test]
+
+
+def fitted_scaler(mean, scale, var=None, n_samples_seen=None):
+    """A StandardScaler restored from its statistics, without refitting.
+
+    With `var` and `n_samples_seen` it can keep learning through `partial_fit()`.
+    """
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(mean, dtype=np.float64)
+    scaler.scale_ = np.asarray(scale, dtype=np.float64)
+    scaler.var_ = scaler.scale_ ** 2 if var is None else np.asarray(var, dtype=np.float64)
+    scaler.n_features_in_ = len(scaler.mean_)
+    if n_samples_seen is not None:
+        scaler.n_samples_seen_ = np.int64(n_samples_seen)
+    return scaler
+
+
+class PreparedData:
+    """Scaled train/val/test arrays plus what is needed to undo the scaling."""
+
+    ARRAYS = ("X_train", "y_train", "X_val", "y_val", "X_test", "y_test")
+
+    def __init__(self, train, val, test, seq_len=SEQ_LEN):
+        self.seq_len = seq_len
+        self.features = common_features(train, seq_len)
+        self.ordered_cols = ordered_columns(self.features, seq_len)
+        X_train, y_train = prepare_X_y(train, self.ordered_cols)
+        X_val, y_val = prepare_X_y(val, self.ordered_cols)
+        X_test, y_test = prepare_X_y(test, self.ordered_cols)
+
+        # Scalers are fit on the training split only
+        self.scaler_X = StandardScaler().fit(X_train)
+        self.scaler_y = StandardScaler().fit(y_train.reshape(-1, 1))
+        self.X_train, self.y_train = self.scale(X_train, y_train)
+        self.X_val, self.y_val = self.scale(X_val, y_val)
+        self.X_test, self.y_test = self.scale(X_test, y_test)
+
+    def save(self, path):
+        np.savez(path, seq_len=self.seq_len, features=np.array(self.features),
+                 x_mean=self.scaler_X.mean_, x_scale=self.scaler_X.scale_,
+                 y_mean=self.scaler_y.mean_, y_scale=self.scaler_y.scale_,
+                 **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, path):
+        """Skips CSV parsing and scaler fitting; the arrays come back exactly as saved."""
+        data = np.load(path)
+        prepared = cls.__new__(cls)
+        prepared.seq_len = int(data["seq_len"])
+        prepared.features = [str(f) for f in data["features"]]
+        prepared.ordered_cols = ordered_columns(prepared.features, prepared.seq_len)
+        prepared.scaler_X = fitted_scaler(data["x_mean"], data["x_scale"])
+        prepared.scaler_y = fitted_scaler(data["y_mean"], data["y_scale"])
+        for name in cls.ARRAYS:
+            setattr(prepared, name, data[name])
+        return prepared
+
+    @property
+    def n_features(self):
+        return len(self.features)
+
+    def scale(self, X, y):
+        X = self.scaler_X.transform(X).astype(np.float32)
+        y = self.scaler_y.transform(y.reshape(-1, 1)).flatten().astype(np.float32)
+        return X, y
+
+    def inverse_y(self, y):
+        return self.scaler_y.inverse_transform(np.asarray(y, dtype=np.float64).reshape(-1, 1)).flatten()
+
+    def arrays(self):
+        return self.X_train, self.y_train, self.X_val, self.y_val, self.X_test, self.y_test
+
+
+def load_splits(train_csv=None, val_csv=None, test_csv=None, seq_len=SEQ_LEN, seed=42):
+    """The notebooks' train/val/test CSVs, or windows built from data/dataset.csv split by player."""
+    if train_csv:
+        return pd.read_csv(train_csv), pd.read_csv(val_csv), pd.read_csv(test_csv)
+    return split_by_player(build_windows(seq_len=seq_len).to_wide_frame(), seed=seed)
+
+
+def cached_prepared_data(cache_dir, train_csv=None, val_csv=None, test_csv=None, seq_len=SEQ_LEN, seed=42):
+    """`PreparedData` for these inputs, read from `cache_dir` when the source files have not changed.
+
+    The cache key covers the source paths, their sizes and modification
+    times, the sequence length and the split seed.
+    """
+    sources = [train_csv, val_csv, test_csv] if train_csv else [DATASET_CSV]
+    stamp = [(os.path.abspath(p), os.path.getsize(p), os.path.getmtime(p)) for p in sources]
+    key = hashlib.sha1(json.dumps([stamp, seq_len, seed]).encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(cache_dir, f"prepared_{key}.npz")
+    if os.path.exists(path):
+        return PreparedData.load(path), path
+    data = PreparedData(*load_splits(train_csv, val_csv, test_csv, seq_len=seq_len, seed=seed), seq_len=seq_len)
+    os.makedirs(cache_dir, exist_ok=True)
+    data.save(path)
+    return data, path
+
+
+# ---- Training -------------------------------------------------------------
+
+class EarlyStopping:
+    def __init__(self, patience=7, min_delta=0.001, verbose=True):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.verbose = verbose
+        self.counter = 0
+        self.best_loss = float('inf')
+        self.early_stop = False
+
+    def __call__(self, val_loss):
+        if val_loss < self.best_loss - self.min_delta:
+            self.best_loss = val_loss
+            self.counter = 0
+        else:
+            self.counter += 1
+            if self.counter >= self.patience:
+                self.early_stop = True
+                if self.verbose:
+                    print(f"Early stopping at counter {self.counter}")
+
+
+def safe_mape(y_true, y_pred):
+    return np.mean(np.abs((y_true - y_pred) / np.clip(np.abs(y_true), 1e-8, None))) * 100
+
+
+def set_seed(seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+
+def configure_threads(threads):
+    """Pin intra- and inter-op threads so runs are comparable."""
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(threads)
+    except RuntimeError:
+        # Can only be set once per process, before any parallel work
+        pass
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def forward(model, xb):
+    # EnhancedTST returns (prediction, attention weights)
+    out = model(xb)
+    return out[0] if isinstance(out, tuple) else out
+
+
+def train_model(model, train_loader, val_loader, optimizer, scheduler=None, scheduler_step="epoch",
+                epochs=100, patience=15, min_delta=0.001, checkpoint_path=None, device="cpu", log_every=5,
+                should_stop=None):
+    """The notebooks' training loop; returns the loss history and timings.
+
+    `scheduler_step` is "epoch" for ReduceLROnPlateau (stepped with the
+    validation loss) or "batch" for OneCycleLR. The best validation weights
+    are kept in memory, loaded back at the end and optionally saved.
+    `should_stop(epoch, val_losses)` is asked after every epoch but the last,
+    e.g. by a sweep pruner; when it returns True training ends with
+    `history["pruned"]`. A run that finishes all epochs is never pruned.
+    """
+    criterion = nn.MSELoss()
+    early_stopping = EarlyStopping(patience=patience, min_delta=min_delta, verbose=False)
+    history = {"train_losses": [], "val_losses": [], "best_val_loss": float('inf'), "best_epoch": 0, "pruned": False}
+    best_state = copy.deepcopy(model.state_dict())
+    train_seconds, samples_seen = 0.0, 0
+    start = time.perf_counter()
+
+    for epoch in range(1, epochs + 1):
+        model.train()
+        total_train = 0
+        epoch_start = time.perf_counter()
+        for xb, yb in train_loader:
+            xb, yb = xb.to(device), yb.to(device)
+            optimizer.zero_grad()
+            loss = criterion(forward(model, xb), yb)
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
+            optimizer.step()
+            if scheduler is not None and scheduler_step == "batch":
+                scheduler.step()
+            total_train += loss.item()
+            samples_seen += len(xb)
+        train_seconds += time.perf_counter() - epoch_start
+        train_loss = total_train / len(train_loader)
+
+        model.eval()
+        total_val = 0
+        with torch.no_grad():
+            for xb, yb in val_loader:
+                xb, yb = xb.to(device), yb.to(device)
+                total_val += criterion(forward(model, xb), yb).item()
+        val_loss = total_val / len(val_loader)
+        history["train_losses"].append(train_loss)
+        history["val_losses"].append(val_loss)
+
+        if scheduler is not None and scheduler_step == "epoch":
+            scheduler.step(val_loss)
+        early_stopping(val_loss)
+        if val_loss < history["best_val_loss"]:
+            history["best_val_loss"] = val_loss
+            history["best_epoch"] = epoch
+            best_state = copy.deepcopy(model.state_dict())
+        if log_every and (epoch % log_every == 0 or epoch == 1):
+            print(f"Epoch {epoch:3d} | Train: {train_loss:.4f} | Val: {val_loss:.4f} | "
+                  f"LR: {optimizer.param_groups[0]['lr']:.2e}")
+        if early_stopping.early_stop:
+            if log_every:
+                print(f"Early stopping at epoch {epoch}")
+            break
+        if should_stop is not None and epoch < epochs and should_stop(epoch, history["val_losses"]):
+            history["pruned"] = True
+            if log_every:
+                print(f"Pruned at epoch {epoch}")
+            break
+
+    model.load_state_dict(best_state)
+    if checkpoint_path:
+        torch.save(best_state, checkpoint_path)
+    history["epochs_run"] = len(history["val_losses"])
+    history["train_time"] = time.perf_counter() - start
+    history["train_samples_per_sec"] = samples_seen / train_seconds if train_seconds else 0.0
+    return history
+
+
+# ---- Evaluation -----------------------------------------------------------
+
+def predict(model, loader, device="cpu"):
+    """Scaled `(y_true, y_pred)` over a loader."""
+    model.eval()
+    y_true, y_pred = [], []
+    with torch.no_grad():
+        for xb, yb in loader:
+            y_pred.append(forward(model, xb.to(device)).cpu().numpy().reshape(-1))
+            y_true.append(yb.numpy().reshape(-1))
+    return np.concatenate(y_true), np.concatenate(y_pred)
+
+
+def regression_metrics(y_true, y_pred):
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "MSE": mse,
+        "MAE": mean_absolute_error(y_true, y_pred),
+        "RMSE": float(np.sqrt(mse)),
+        "R2": r2_score(y_true, y_pred),
+        "MAPE": safe_mape(y_true, y_pred),
+    }
+
+
+def evaluate(model, loader, data, device="cpu"):
+    """Metrics on the original (inverse-scaled) target plus test-set throughput."""
+    start = time.perf_counter()
+    y_true, y_pred = predict(model, loader, device)
+    elapsed = time.perf_counter() - start
+    metrics = regression_metrics(data.inverse_y(y_true), data.inverse_y(y_pred))
+    metrics["inference_time"] = elapsed
+    metrics["inference_samples_per_sec"] = len(y_true) / elapsed if elapsed else 0.0
+    return metrics
+
+
+def latency_percentiles(model, X, n_samples=200, batch_size=1, warmup=10, device="cpu",
+                        percentiles=LATENCY_PERCENTILES):
+    """Per-request latency in milliseconds for `batch_size`-row requests taken from X."""
+    model.eval()
+    X = torch.as_tensor(X, dtype=torch.float32)
+    n_requests = warmup + n_samples
+    timings = []
+    with torch.no_grad():
+        for i in range(n_requests):
+            start = (i * batch_size) % max(len(X) - batch_size + 1, 1)
+            xb = X[start:start + batch_size].to(device)
+            t0 = time.perf_counter()
+            forward(model, xb)
+            if i >= warmup:
+                timings.append((time.perf_counter() - t0) * 1000)
+    return {f"p{p}_ms": float(np.percentile(timings, p)) for p in percentiles}
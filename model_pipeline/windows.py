@@ -0,0 +1,206 @@
+"""Per-player sliding windows built straight from data/dataset.csv.
+
+Each player's season rows (sorted by season, same-season rows in scraped CSV
+order) become one float32 feature matrix. Windows of `seq_len` consecutive rows
+are strided views into that matrix, so the `(samples, seq_len, features)` array
+is never copied; only the valid window start offsets are stored. The target
+of a window is the `Bonservis` of its last row, as in models_dataset.csv.
+
+Like models_dataset.csv, only players with at least `seq_len` distinct seasons
+get windows; players with several competitions in fewer seasons are dropped.
+With data/dataset.csv this gives the same 2852 windows of the same 353 players
+(Oyuncu_ID 0..352), with the same per-season counts and targets, and missing
+stats are imputed the same way. 407 windows of 58 players differ in the order
+of same-season rows: all of these players have 17+ rows, where the original
+pipeline's unstable quicksort reordered ties. That order cannot be reproduced
+from the CSV, so the scraped order is kept instead. The only imputed value
+that differs is xA of midfielders in the Europa League (0.465 here, 0.46 in
+models_dataset.csv, whose group must have held one row more or less).
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from model_pipeline.dataset_store import STAT_COLUMNS, TARGET_COLUMN, load_dataset
+
+SEQ_LEN = 5
+
+# Leagues kept as their own one-hot column, everything else is Other_Domestic / Other_International
+TOP_LEAGUES = [
+    "Bundesliga", "CONMEBOL Libertadores", "CONMEBOL Sudamericana", "Championship", "Eredivisie",
+    "FIFA Club World Cup", "LaLiga", "Ligue 1", "Premier League", "Serie A", "UEFA Champions League",
+    "UEFA Conference League", "UEFA Europa League", "UEFA Super Cup",
+]
+LEAGUE_GROUPS = sorted(TOP_LEAGUES + ["Other_Domestic", "Other_International"])
+CATEGORIES = ["Domestic leagues", "International competitions"]
+POSITIONS = ["D", "F", "OS"]
+
+LEAGUE_COLUMNS = [f"Lig_Donusturulmus_{g}" for g in LEAGUE_GROUPS]
+CATEGORY_COLUMNS = [f"Kategori_{c}" for c in CATEGORIES]
+POSITION_COLUMNS = [f"Mevki_{p}" for p in POSITIONS]
+
+# Column order of one season inside models_dataset.csv
+ROW_COLUMNS = ["Yaş"] + STAT_COLUMNS + LEAGUE_COLUMNS + CATEGORY_COLUMNS + POSITION_COLUMNS + [TARGET_COLUMN, "Sezon"]
+# Model inputs: every season column except the target, sorted like the notebooks' common_features
+FEATURE_COLUMNS = sorted(c for c in ROW_COLUMNS if c != TARGET_COLUMN)
+
+
+def season_features(df):
+    """One numeric row per player season with imputed stats and one-hot encodings."""
+    out = pd.DataFrame(index=df.index)
+    out["Yaş"] = df["Yaş"].astype("float32")
+    out["Sezon"] = df["Sezon_Yil"].astype("float32")
+
+    # Missing stats get the median of the same position and league, as in models_dataset.csv
+    stats = df[STAT_COLUMNS].astype("float32")
+    group_median = stats.groupby([df["Mevki"], df["Lig"]], observed=True).transform("median")
+    filled = stats.fillna(group_median)
+    # Leagues without any value for a stat fall back to the median of the group-filled column
+    out[STAT_COLUMNS] = filled.fillna(filled.median())
+
+    lig = df["Lig"].astype(str)
+    other = np.where(df["Kategori"].astype(str) == "International competitions", "Other_International", "Other_Domestic")
+    league_group = np.where(lig.isin(TOP_LEAGUES), lig, other)
+    for group, col in zip(LEAGUE_GROUPS, LEAGUE_COLUMNS):
+        out[col] = (league_group == group).astype("float32")
+    for category, col in zip(CATEGORIES, CATEGORY_COLUMNS):
+        out[col] = (df["Kategori"].astype(str) == category).astype("float32")
+    for position, col in zip(POSITIONS, POSITION_COLUMNS):
+        out[col] = (df["Mevki"].astype(str) == position).astype("float32")
+    return out
+
+
+class WindowSet:
+    """Zero-copy `(samples, seq_len, n_features)` windows over the season matrix."""
+
+    def __init__(self, features, bonservis, player_ids, seasons, starts, seq_len, player_names):
+        self.features = features          # (n_rows, n_features) float32, C-contiguous
+        self.bonservis = bonservis        # (n_rows,) float64
+        self.player_ids = player_ids      # (n_rows,) int32, -1 for players without windows
+        self.seasons = seasons            # (n_rows,) season start years
+        self.starts = starts              # (n_samples,) first row of each window
+        self.seq_len = seq_len
+        self.player_names = player_names
+        self.feature_names = list(FEATURE_COLUMNS)
+        # Every possible window as a view; starts picks the ones inside a single player
+        self.all_windows = sliding_window_view(features, seq_len, axis=0).transpose(0, 2, 1)
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def n_features(self):
+        return self.features.shape[1]
+
+    @property
+    def targets(self):
+        return self.bonservis[self.starts + self.seq_len - 1]
+
+    @property
+    def oyuncu_ids(self):
+        return self.player_ids[self.starts]
+
+    @property
+    def dates(self):
+        return self.seasons[self.starts + self.seq_len - 1]
+
+    def window(self, i):
+        # View, no copy
+        return self.all_windows[self.starts[i]]
+
+    def take(self, idx):
+        """Materialize only the requested windows, e.g. one batch."""
+        return self.all_windows[self.starts[idx]]
+
+    def to_flat(self):
+        """(samples, seq_len * n_features) in the notebooks' `ordered_cols` order (copies)."""
+        return self.take(np.arange(len(self))).reshape(len(self), -1)
+
+    def to_wide_frame(self):
+        """Rebuild the models_dataset.csv layout (duplicated wide rows) for older consumers."""
+        row_matrix = pd.DataFrame(self.features, columns=self.feature_names)
+        row_matrix[TARGET_COLUMN] = self.bonservis
+        row_matrix = row_matrix[ROW_COLUMNS].to_numpy()
+        parts = {"Oyuncu_ID": self.oyuncu_ids, "Date": self.dates.astype(int)}
+        for t in range(self.seq_len):
+            block = row_matrix[self.starts + t]
+            for j, col in enumerate(ROW_COLUMNS):
+                if col == TARGET_COLUMN and t == self.seq_len - 1:
+                    continue
+                parts[f"{col}_t{t + 1}"] = block[:, j]
+        parts["target"] = self.targets
+        return pd.DataFrame(parts)
+
+    def save(self, path):
+        # Only the per-season matrix and window offsets are stored, not the duplicated windows
+        np.savez_compressed(path, features=self.features, bonservis=self.bonservis, player_ids=self.player_ids,
+                            seasons=self.seasons, starts=self.starts, seq_len=self.seq_len,
+                            player_names=np.array(self.player_names, dtype=object))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=True)
+        return cls(data["features"], data["bonservis"], data["player_ids"], data["seasons"], data["starts"],
+                   int(data["seq_len"]), list(data["player_names"]))
+
+
+def distinct_seasons(player_codes, seasons):
+    """Number of distinct seasons of each row's player."""
+    pairs = np.unique(np.stack([player_codes, np.nan_to_num(seasons, nan=-1)]), axis=1)
+    counts = np.bincount(pairs[0].astype(np.int64), minlength=player_codes.max() + 1 if len(player_codes) else 0)
+    return counts[player_codes]
+
+
+def build_windows(df=None, seq_len=SEQ_LEN, min_seasons=None):
+    """Build the windows for every player with at least `min_seasons` (default `seq_len`) distinct seasons."""
+    df = load_dataset() if df is None else df
+    min_seasons = seq_len if min_seasons is None else min_seasons
+    # load_dataset() already sorts by player and season
+    player_codes = df["Oyuncu"].cat.codes.to_numpy().astype(np.int32)
+    features = np.ascontiguousarray(season_features(df)[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+    bonservis = df[TARGET_COLUMN].astype("float64").to_numpy(na_value=np.nan)
+    seasons = df["Sezon_Yil"].astype("float64").to_numpy(na_value=np.nan)
+
+    n_windows = len(df) - seq_len + 1
+    if n_windows <= 0:
+        starts = np.empty(0, dtype=np.int64)
+    else:
+        # A window is valid when its first and last row belong to the same player, that player
+        # has enough seasons and the window has a target
+        same_player = player_codes[:n_windows] == player_codes[seq_len - 1:]
+        enough_seasons = distinct_seasons(player_codes, seasons)[:n_windows] >= min_seasons
+        has_target = ~np.isnan(bonservis[seq_len - 1:])
+        starts = np.flatnonzero(same_player & enough_seasons & has_target)
+
+    # Number the players that have windows 0..n-1 like models_dataset.csv's Oyuncu_ID; rows of the others get -1
+    kept = np.unique(player_codes[starts])
+    new_codes = np.full(len(df["Oyuncu"].cat.categories) + 1, -1, dtype=np.int32)
+    new_codes[kept] = np.arange(len(kept), dtype=np.int32)
+    player_ids = new_codes[player_codes]
+    player_names = list(df["Oyuncu"].cat.categories[kept])
+    return WindowSet(features, bonservis, player_ids, seasons, starts, seq_len, player_names)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build sliding player windows from data/dataset.csv.")
+    parser.add_argument("--seq-len", type=int, default=SEQ_LEN)
+    parser.add_argument("--min-seasons", type=int, default=None,
+                        help="Skip players with fewer distinct seasons (default: --seq-len)")
+    parser.add_argument("--save", default=None, help="Save the compact window set (.npz)")
+    parser.add_argument("--wide-csv", default=None, help="Also write the wide models_dataset.csv layout")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    windows = build_windows(seq_len=args.seq_len, min_seasons=args.min_seasons)
+    elapsed = time.perf_counter() - start
+    wide_bytes = len(windows) * windows.seq_len * windows.n_features * 4
+    print(f"✅ {len(windows)} windows of shape ({windows.seq_len}, {windows.n_features}) in {elapsed:.2f}s")
+    print(f"Season matrix: {windows.features.nbytes / 1e6:.2f} MB (materialized windows would be {wide_bytes / 1e6:.2f} MB)")
+    if args.save:
+        windows.save(args.save)
+        print(f"Saved → {args.save}")
+    if args.wide_csv:
+        windows.to_wide_frame().to_csv(args.wide_csv, index=False)
+        print(f"Wide layout → {args.wide_csv}")
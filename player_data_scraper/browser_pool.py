@@ -0,0 +1,115 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+
+# 🔧 Pool defaults
+DEFAULT_CONCURRENCY = 4
+PAGES_PER_BROWSER = 2
+MAX_USES_PER_PAGE = 25
+
+
+class BrowserPool:
+    """Long-lived Chromium instances shared by concurrent scraping workers.
+
+    Each worker slot owns one context + page. A page is handed out through
+    `page()`, reused for the next player and recycled (fresh context) after
+    `max_uses_per_page` players or after an error left it in a bad state.
+    With a `request_router.RequestRouter`, every context gets its routes.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, pages_per_browser=PAGES_PER_BROWSER,
+                 headless=True, max_uses_per_page=MAX_USES_PER_PAGE, router=None):
+        self.concurrency = max(1, concurrency)
+        self.pages_per_browser = max(1, pages_per_browser)
+        self.headless = headless
+        self.max_uses_per_page = max_uses_per_page
+        self.router = router
+        self._playwright = None
+        self._browsers = []
+        self._all_slots = []
+        self._slots = asyncio.Queue()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        self._playwright = await async_playwright().start()
+        n_browsers = math.ceil(self.concurrency / self.pages_per_browser)
+        for _ in range(n_browsers):
+            self._browsers.append(await self._playwright.chromium.launch(headless=self.headless))
+        for i in range(self.concurrency):
+            browser = self._browsers[i % n_browsers]
+            context, page = await self._new_page(browser)
+            slot = {"browser": browser, "context": context, "page": page, "uses": 0}
+            self._all_slots.append(slot)
+            self._slots.put_nowait(slot)
+        print(f"🚀 Browser pool ready: {n_browsers} browser(s), {self.concurrency} worker page(s)")
+
+    async def _new_page(self, browser):
+        if self.router is None:
+            context = await browser.new_context()
+        else:
+            # Service workers would fetch behind the routes' back
+            context = await browser.new_context(service_workers="block")
+            await self.router.attach(context)
+        page = await context.new_page()
+        return context, page
+
+    async def _recycle(self, slot):
+        try:
+            await slot["context"].close()
+        except Exception as e:
+            print(f"⚠️ Could not close browser context: {e}")
+        try:
+            slot["context"], slot["page"] = await self._new_page(slot["browser"])
+        except Exception as e:
+            # Browser process most likely crashed, start a replacement for this slot
+            print(f"⚠️ Browser unusable, relaunching: {e}")
+            old_browser = slot["browser"]
+            new_browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._browsers = [new_browser if b is old_browser else b for b in self._browsers]
+            try:
+                await old_browser.close()
+            except Exception:
+                pass
+            for other in self._all_slots:
+                if other["browser"] is old_browser:
+                    other["browser"] = new_browser
+            slot["browser"] = new_browser
+            slot["context"], slot["page"] = await self._new_page(new_browser)
+        slot["uses"] = 0
+
+    @asynccontextmanager
+    async def page(self):
+        slot = await self._slots.get()
+        failed = False
+        try:
+            yield slot["page"]
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            slot["uses"] += 1
+            try:
+                if failed or slot["uses"] >= self.max_uses_per_page or slot["page"].is_closed():
+                    await self._recycle(slot)
+            finally:
+                self._slots.put_nowait(slot)
+
+    async def close(self):
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"⚠️ Could not close browser: {e}")
+        self._browsers = []
+        self._all_slots = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        print("Browser pool closed.")
@@ -0,0 +1,44 @@
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from request_router import fixture_name
+
+
+# 📼 Serves pages recorded with --record-pages so the scrapers can run offline with --site-origin
+def make_handler(fixture_dir):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = os.path.join(fixture_dir, fixture_name(self.path))
+            if not os.path.exists(path + ".json"):
+                self.send_error(404, "No recorded response")
+                return
+            with open(path + ".json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", meta.get("content-type") or "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded Sofascore pages for offline scraper runs.")
+    parser.add_argument("fixture_dir", help="Directory written by --record-pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.fixture_dir))
+    print(f"📼 Serving {args.fixture_dir} on http://{args.host}:{args.port} (use --site-origin with the scrapers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
@@ -0,0 +1,116 @@
+import csv
+import os
+
+PARQUET_ROW_GROUP_SIZE = 500
+
+
+class CsvSink:
+    """Appends rows to a CSV file as soon as a player is finished.
+
+    The header is written once with a fixed column order, every batch is
+    flushed to disk, so an interrupted run keeps all completed players.
+    """
+
+    def __init__(self, path, columns, append=False):
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # When resuming, keep the existing rows and header
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self._file = open(path, "w" if write_header else "a", newline="",
+                          encoding="utf-8-sig" if write_header else "utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+        if write_header:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def write_frame(self, df):
+        if df is None or df.empty:
+            return
+        frame = df.reindex(columns=self.columns)
+        frame = frame.astype(object).where(frame.notna(), None)
+        self._writer.writerows(frame.to_dict("records"))
+        self._file.flush()
+        self.rows_written += len(frame)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetSink:
+    """Writes rows into Parquet row groups of `row_group_size` rows.
+
+    Rows are buffered until a row group is full. Note that a Parquet file
+    only becomes readable once `close()` wrote its footer; use CsvSink when
+    crash safety matters more than file size.
+    """
+
+    def __init__(self, path, columns, row_group_size=PARQUET_ROW_GROUP_SIZE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+        self._pa = pa
+        self.path = path
+        self.columns = list(columns)
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._buffer = []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._schema = pa.schema([(c, pa.int64() if c == "Age" else pa.string()) for c in self.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_frame(self, df):
+        if df is None or df.empty:
+            return
+        frame = df.reindex(columns=self.columns)
+        frame = frame.astype(object).where(frame.notna(), None)
+        for row in frame.to_dict("records"):
+            self._buffer.append({c: self._cast(c, row[c]) for c in self.columns})
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    @staticmethod
+    def _cast(column, value):
+        if value is None:
+            return None
+        return int(value) if column == "Age" else str(value)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        table = self._pa.Table.from_pylist(self._buffer, schema=self._schema)
+        self._writer.write_table(table)
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_sink(path, columns, fmt="csv", append=False):
+    if fmt == "csv":
+        return CsvSink(path, columns, append=append)
+    if fmt == "parquet":
+        if append:
+            raise ValueError("Parquet output cannot be appended to, use csv output for resumable runs")
+        return ParquetSink(path, columns)
+    raise ValueError(f"Unknown output format: {fmt}")
@@ -0,0 +1,114 @@
+import time
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Resolves once the rows under `selector` differ from `previous` (or a new `or_selector`
+# element appeared) and have stayed identical for `stableMs`, i.e. the table finished rendering.
+ROWS_CHANGED_JS = """([selector, previous, orSelector, stableMs]) => {
+    if (orSelector && Array.from(document.querySelectorAll(orSelector)).some(el => !el.hasAttribute('data-rows-wait-stale'))) return true;
+    const rows = Array.from(document.querySelectorAll(selector));
+    const signature = rows.map(r => r.innerText).join('\\u241e');
+    const state = window.__rowsWait;
+    if (!rows.length || (previous !== null && signature === previous)) { state.signature = null; return false; }
+    if (state.signature !== signature) { state.signature = signature; state.since = performance.now(); return false; }
+    return performance.now() - state.since >= stableMs;
+}"""
+
+POLL_INTERVAL_MS = 50
+STABLE_MS = 150
+
+# True when a tab/link element is the active one (ARIA state or an active/selected class)
+IS_SELECTED_JS = """(el) => el.getAttribute('aria-selected') === 'true'
+    || el.getAttribute('aria-current') === 'page'
+    || el.getAttribute('aria-pressed') === 'true'
+    || el.getAttribute('data-active') === 'true'
+    || (typeof el.className === 'string' && /(^|[\\s_-])(active|selected)($|[\\s_-])/i.test(el.className))"""
+
+
+async def rows_signature(page, selector):
+    return await page.evaluate(
+        "(selector) => Array.from(document.querySelectorAll(selector)).map(r => r.innerText).join('\\u241e')",
+        selector,
+    )
+
+
+async def wait_for_rows_change(page, selector, previous, timeout=10000, or_selector=None,
+                               timer=None, step=None):
+    """Wait until the rows matched by `selector` change from `previous` and settle.
+
+    Pass previous=None to only wait for non-empty, settled rows. Returns False
+    instead of raising when nothing changed within `timeout` ms, so callers can
+    go on with whatever the page shows.
+    """
+    start = time.perf_counter()
+    changed = True
+    try:
+        await page.evaluate("() => { window.__rowsWait = {}; }")
+        await page.wait_for_function(ROWS_CHANGED_JS, arg=[selector, previous, or_selector, STABLE_MS],
+                                     polling=POLL_INTERVAL_MS, timeout=timeout)
+    except Exception:
+        changed = False
+    if timer is not None and step is not None:
+        timer.record(step, time.perf_counter() - start)
+        if not changed:
+            timer.record(f"{step} (timeout)", time.perf_counter() - start)
+            timer.count("timeouts", f"rows change after {step}")
+    return changed
+
+
+async def is_selected(element):
+    return await element.evaluate(IS_SELECTED_JS)
+
+
+async def select_tab_and_wait(page, tab, selector, timeout=10000, or_selector=None, timer=None, step=None):
+    """Click a tab (selector or element handle) and wait for the rows to change, unless it is already active.
+
+    Returns False when the tab is missing or the rows never changed, so the
+    caller can skip it instead of reading the previous tab's rows.
+    """
+    if isinstance(tab, str):
+        tab = await page.query_selector(tab)
+    if tab is None:
+        return False
+    if await is_selected(tab):
+        # Already showing this tab's rows, a click would not change them
+        if timer is not None and step is not None:
+            timer.count("already selected", step)
+        return True
+    return await click_and_wait_for_rows(page, tab, selector, timeout=timeout, or_selector=or_selector,
+                                         timer=timer, step=step)
+
+
+async def wait_for_selector(page, selector, timer=None, target=None, **kwargs):
+    """`page.wait_for_selector` that counts timeouts per selector (or `target` name) before re-raising."""
+    try:
+        return await page.wait_for_selector(selector, **kwargs)
+    except PlaywrightTimeoutError:
+        if timer is not None:
+            timer.count("timeouts", target or selector)
+        raise
+
+
+async def wait_for_locator(locator, target, timer=None, **kwargs):
+    # Same for locators, which are too long to report by selector
+    try:
+        await locator.wait_for(**kwargs)
+    except PlaywrightTimeoutError:
+        if timer is not None:
+            timer.count("timeouts", target)
+        raise
+
+
+async def click_and_wait_for_rows(page, click_target, selector, timeout=10000, or_selector=None,
+                                  timer=None, step=None):
+    # `click_target` is either a selector string or an element handle
+    previous = await rows_signature(page, selector)
+    if or_selector:
+        # An `or_selector` element left over from the previous view (e.g. its no-results icon) does not count
+        await page.evaluate("(s) => document.querySelectorAll(s).forEach(el => el.setAttribute('data-rows-wait-stale', ''))",
+                            or_selector)
+    if isinstance(click_target, str):
+        await page.click(click_target)
+    else:
+        await click_target.click()
+    return await wait_for_rows_change(page, selector, previous, timeout=timeout, or_selector=or_selector,
+                                      timer=timer, step=step)
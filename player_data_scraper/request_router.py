@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+from step_timer import StepTimer
+
+# 🔧 What a scraped page does not need: the stats tables are plain DOM filled by XHR/fetch calls
+DEFAULT_BLOCKED_TYPES = ["image", "media", "font"]
+DEFAULT_BLOCKED_DOMAINS = [
+    "googletagmanager.com", "google-analytics.com", "googlesyndication.com", "googleadservices.com",
+    "doubleclick.net", "adservice.google.com", "amazon-adsystem.com", "facebook.net", "facebook.com",
+    "scorecardresearch.com", "criteo.com", "criteo.net", "taboola.com", "outbrain.com", "hotjar.com",
+    "quantserve.com", "adnxs.com", "rubiconproject.com", "pubmatic.com", "casalemedia.com", "onetrust.com",
+    "cookielaw.org", "sentry.io",
+]
+# Resource types whose responses are the same for every player and may be cached locally
+CACHEABLE_TYPES = {"script", "stylesheet", "font", "image"}
+
+SITE_ORIGIN = "https://www.sofascore.com"
+
+
+def domain_matches(host, domains):
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def fixture_name(url):
+    """File name of a recorded response: the URL path flattened, plus a hash of the query."""
+    parts = urlsplit(url)
+    name = parts.path.strip("/").replace("/", "__") or "index"
+    if parts.query:
+        name += "__" + hashlib.sha1(parts.query.encode("utf-8")).hexdigest()[:10]
+    return name[:200]
+
+
+class StaticAssetCache:
+    """On-disk cache of static responses (scripts, styles, ...) shared by all pages of a run."""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest())
+
+    def get(self, url):
+        if url in self._memory:
+            return self._memory[url]
+        path = self._path(url)
+        if not os.path.exists(path + ".json"):
+            return None
+        with open(path + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(path + ".body", "rb") as f:
+            entry = (meta["status"], meta["headers"], f.read())
+        self._memory[url] = entry
+        return entry
+
+    def put(self, url, status, headers, body):
+        # Body first, metadata last: a half-written entry is never read
+        headers = {k: v for k, v in headers.items() if k.lower() not in ("content-length", "content-encoding")}
+        path = self._path(url)
+        with open(path + ".body", "wb") as f:
+            f.write(body)
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"url": url, "status": status, "headers": headers}, f)
+        self._memory[url] = (status, headers, body)
+
+
+class RequestRouter:
+    """Playwright context route that keeps only what the stats pages need.
+
+    - requests of `blocked_types` (except the page document) and to
+      `blocked_domains` are aborted before they leave the browser;
+    - with `cache_dir`, static assets are served from a local cache after
+      the first player;
+    - with `site_origin`, requests to SITE_ORIGIN are fetched from another
+      origin instead (e.g. a local fixture_server.py) while the page keeps
+      its sofascore.com URL, so the scrapers run unchanged against recorded
+      pages;
+    - with `record_dir`, documents and XHR/fetch responses are saved in the
+      layout fixture_server.py serves.
+
+    Counts go to `timer` ("blocked requests", "asset cache", ...).
+    """
+
+    def __init__(self, blocked_types=DEFAULT_BLOCKED_TYPES, blocked_domains=DEFAULT_BLOCKED_DOMAINS,
+                 cache_dir=None, site_origin=None, record_dir=None, timer=None):
+        self.blocked_types = set(blocked_types or [])
+        self.blocked_domains = list(blocked_domains or [])
+        self.cache = StaticAssetCache(cache_dir) if cache_dir else None
+        self.site_origin = site_origin.rstrip("/") if site_origin else None
+        self.record_dir = record_dir
+        self.timer = timer if timer is not None else StepTimer()
+        if record_dir:
+            os.makedirs(record_dir, exist_ok=True)
+
+    async def attach(self, context):
+        await context.route("**/*", self.handle)
+
+    def upstream_url(self, url):
+        if self.site_origin and url.startswith(SITE_ORIGIN):
+            return self.site_origin + url[len(SITE_ORIGIN):]
+        return url
+
+    async def handle(self, route):
+        request = route.request
+        url = request.url
+        resource_type = request.resource_type
+        host = urlsplit(url).hostname or ""
+
+        if resource_type in self.blocked_types and resource_type != "document":
+            self.timer.count("blocked requests", resource_type)
+            return await route.abort("blockedbyclient")
+        if domain_matches(host, self.blocked_domains):
+            self.timer.count("blocked requests", host)
+            return await route.abort("blockedbyclient")
+
+        cacheable = self.cache is not None and request.method == "GET" and resource_type in CACHEABLE_TYPES
+        if cacheable:
+            cached = self.cache.get(url)
+            if cached is not None:
+                status, headers, body = cached
+                self.timer.count("asset cache", "hit")
+                self.timer.count("asset cache bytes", n=len(body))
+                return await route.fulfill(status=status, headers=headers, body=body)
+            self.timer.count("asset cache", "miss")
+
+        upstream = self.upstream_url(url)
+        record = self.record_dir and request.method == "GET" and resource_type in ("document", "xhr", "fetch")
+        if upstream == url and not cacheable and not record:
+            return await route.continue_()
+
+        try:
+            response = await route.fetch(url=upstream)
+            body = await response.body()
+        except Exception as e:
+            self.timer.count("failed requests", host)
+            print(f"⚠️ Request failed ({upstream}): {e}")
+            return await route.abort("failed")
+        if cacheable and response.status == 200 and "no-store" not in response.headers.get("cache-control", ""):
+            self.cache.put(url, response.status, response.headers, body)
+        if record and response.ok:
+            self.save_fixture(url, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    def save_fixture(self, url, headers, body):
+        path = os.path.join(self.record_dir, fixture_name(url))
+        with open(path + ".body", "wb") as f:
+            f.write(body)
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump({"url": url, "content-type": headers.get("content-type", "")}, f)
+
+    def summary(self):
+        blocked = self.timer.targets("blocked requests")
+        top = ", ".join(f"{k} {n}" for k, n in sorted(blocked.items(), key=lambda item: -item[1])[:5])
+        line = f"🛡️ Blocked {sum(blocked.values())} requests" + (f" ({top})" if top else "")
+        if self.cache is not None:
+            line += (f", asset cache {self.timer.counter('asset cache', 'hit')} hits / "
+                     f"{self.timer.counter('asset cache', 'miss')} misses "
+                     f"({self.timer.counter('asset cache bytes') / 1e6:.1f} MB served locally)")
+        return line
+
+
+def add_router_arguments(parser):
+    group = parser.add_argument_group("request blocking")
+    group.add_argument("--no-blocking", action="store_true", help="Load pages with every resource (no routing)")
+    group.add_argument("--block-types", nargs="*", default=DEFAULT_BLOCKED_TYPES,
+                       help="Playwright resource types to abort (default: %(default)s)")
+    group.add_argument("--block-domains", nargs="*", default=[],
+                       help="Extra domains to abort on top of the built-in ad/analytics list")
+    group.add_argument("--asset-cache", default=None, help="Cache static assets in this directory across players")
+    group.add_argument("--site-origin", default=None,
+                       help="Fetch sofascore.com pages from this origin instead, e.g. a local fixture_server.py")
+    group.add_argument("--record-pages", default=None, help="Save fetched pages and XHR responses as fixtures here")
+
+
+def router_from_args(args, timer=None):
+    if args.no_blocking and not (args.asset_cache or args.site_origin or args.record_pages):
+        return None
+    blocked_types = [] if args.no_blocking else args.block_types
+    blocked_domains = [] if args.no_blocking else DEFAULT_BLOCKED_DOMAINS + args.block_domains
+    return RequestRouter(blocked_types, blocked_domains, cache_dir=args.asset_cache, site_origin=args.site_origin,
+                         record_dir=args.record_pages, timer=timer)
@@ -0,0 +1,87 @@
+import os
+import sqlite3
+from datetime import datetime
+
+DONE = "done"
+FAILED = "failed"
+SKIPPED_GOALKEEPER = "skipped_goalkeeper"
+
+# Statuses that never need another attempt
+FINISHED_STATUSES = (DONE, SKIPPED_GOALKEEPER)
+
+
+class ScrapeJournal:
+    """Per-slug completion journal stored in SQLite.
+
+    Every finished, failed or skipped player is recorded right away so an
+    interrupted run can be resumed without scraping finished players again.
+    """
+
+    def __init__(self, path="output/scrape_journal.sqlite"):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS slugs (
+                   slug TEXT PRIMARY KEY,
+                   status TEXT NOT NULL,
+                   attempts INTEGER NOT NULL DEFAULT 0,
+                   rows INTEGER NOT NULL DEFAULT 0,
+                   last_error TEXT,
+                   updated_at TEXT NOT NULL
+               )"""
+        )
+        self._conn.commit()
+
+    def record(self, slug, status, rows=0, error=None):
+        self._conn.execute(
+            """INSERT INTO slugs (slug, status, attempts, rows, last_error, updated_at)
+               VALUES (?, ?, 1, ?, ?, ?)
+               ON CONFLICT(slug) DO UPDATE SET
+                   status = excluded.status,
+                   attempts = slugs.attempts + 1,
+                   rows = excluded.rows,
+                   last_error = excluded.last_error,
+                   updated_at = excluded.updated_at""",
+            (slug, status, rows, error, datetime.now().isoformat(timespec="seconds")),
+        )
+        self._conn.commit()
+
+    def status(self, slug):
+        row = self._conn.execute("SELECT status, attempts FROM slugs WHERE slug = ?", (slug,)).fetchone()
+        return (row[0], row[1]) if row else (None, 0)
+
+    def pending(self, slug_list, max_total_attempts=None):
+        """Slugs that are not finished yet: never tried, or failed.
+
+        Failed slugs are retried on every resume unless `max_total_attempts`
+        (counted across all runs) is given and used up.
+        """
+        pending = []
+        for slug in slug_list:
+            status, attempts = self.status(slug)
+            if status in FINISHED_STATUSES:
+                continue
+            if status == FAILED and max_total_attempts is not None and attempts >= max_total_attempts:
+                continue
+            pending.append(slug)
+        return pending
+
+    def finished(self, slug_list):
+        return [slug for slug in slug_list if self.status(slug)[0] in FINISHED_STATUSES]
+
+    def summary(self):
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM slugs GROUP BY status").fetchall())
+
+    def reset(self):
+        self._conn.execute("DELETE FROM slugs")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,70 +1,141 @@
-
-import asyncio
-from playwright.async_api import async_playwright
-import os
-
-async def get_premier_league_slugs():
-    url = "https://www.sofascore.com/tournament/football/england/premier-league/17#id:61627"
-
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
-
-        print(f"🌐 Opening: {url}")
-        await page.goto(url, timeout=60000)
-        await page.wait_for_timeout(3000)
-
-        # Tüm takım linklerini al
-        team_links = await page.query_selector_all("a[href^='/team/football']")
-        team_urls = set()
-
-        for link in team_links:
-            href = await link.get_attribute("href")
-            if href:
-                team_urls.add("https://www.sofascore.com" + href.split("?")[0])
-
-        print(f"📌 {len(team_urls)} teams found")
-
-        all_slugs = set()
-
-        # Her takım sayfasına git, kadro sayfasına yönlen
-        for team_url in team_urls:
-            try:
-                print(f"🔍 Processing team: {team_url}")
-                await page.goto(team_url, timeout=60000)
-                await page.wait_for_timeout(2000)
-
-                try:
-                    squad_button = await page.query_selector("a:has-text('Squad')")
-                    if squad_button:
-                        await squad_button.click()
-                        await page.wait_for_timeout(2000)
-                except:
-                    print("⚠️ Squad tab not found, searching for players directly")
-
-                player_links = await page.query_selector_all("a[href*='/player/']")
-
-                for a in player_links:
-                    href = await a.get_attribute("href")
-                    if href and "/player/" in href:
-                        parts = href.strip("/").split("/player/")[-1].split("/")
-                        if len(parts) >= 2:
-                            slug = f"{parts[-2]}/{parts[-1]}"
-                            all_slugs.add(slug)
-
-            except Exception as e:
-                print(f"⚠️ Error (skipping team page): {e}")
-                continue
-
-        await browser.close()
-
-        
-        os.makedirs("output", exist_ok=True)
-        with open("output/premier_slug_list.txt", "w", encoding="utf-8") as f:
-            for slug in sorted(all_slugs):
-                f.write(slug + "\n")
-
-        print(f"\n✅ Total of {len(all_slugs)} oyuncu slug saved → output/premier_slug_list.txt")
-
-if __name__ == "__main__":
-    asyncio.run(get_premier_league_slugs())
\ No newline at end of file
+import asyncio
+import argparse
+from browser_pool import BrowserPool, DEFAULT_CONCURRENCY
+from request_router import add_router_arguments, router_from_args
+from page_waits import select_tab_and_wait, wait_for_rows_change
+import os
+
+# 🔧 Tournaments that can be crawled, the key is used in the output file names
+TOURNAMENTS = {
+    "premier": "https://www.sofascore.com/tournament/football/england/premier-league/17#id:61627",
+    "laliga": "https://www.sofascore.com/tournament/football/spain/laliga/8",
+    "seriea": "https://www.sofascore.com/tournament/football/italy/serie-a/23",
+    "bundesliga": "https://www.sofascore.com/tournament/football/germany/bundesliga/35",
+    "ligue1": "https://www.sofascore.com/tournament/football/france/ligue-1/34",
+}
+
+OUTPUT_DIR = "output"
+
+PLAYER_LINK_SELECTOR = "a[href*='/player/']"
+SQUAD_TAB_SELECTOR = "a:has-text('Squad')"
+
+def slug_list_path(key):
+    return os.path.join(OUTPUT_DIR, f"{key}_slug_list.txt")
+
+def read_slug_file(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def write_slug_file(path, slugs):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for slug in sorted(slugs):
+            f.write(slug + "\n")
+
+# 🔍 Team page URLs of a tournament
+async def get_team_urls(pool, url):
+    async with pool.page() as page:
+        print(f"🌐 Opening: {url}")
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        await page.wait_for_selector("a[href^='/team/football']", state='attached', timeout=30000)
+
+        # Tüm takım linklerini al
+        team_links = await page.query_selector_all("a[href^='/team/football']")
+        team_urls = set()
+        for link in team_links:
+            href = await link.get_attribute("href")
+            if href:
+                team_urls.add("https://www.sofascore.com" + href.split("?")[0])
+        return team_urls
+
+# 👥 Player slugs on one team page, None when the page could not be read
+async def get_team_slugs(pool, team_url):
+    slugs = set()
+    try:
+        async with pool.page() as page:
+            print(f"🔍 Processing team: {team_url}")
+            await page.goto(team_url, timeout=60000, wait_until="domcontentloaded")
+
+            try:
+                # The tab only exists after hydration, so wait for it instead of querying right away
+                await page.wait_for_selector(SQUAD_TAB_SELECTOR, state='visible', timeout=15000)
+                squad_tab_found = True
+            except Exception:
+                squad_tab_found = False
+            if squad_tab_found:
+                # The overview already links a few players: wait until the squad replaced them and settled
+                if not await select_tab_and_wait(page, SQUAD_TAB_SELECTOR, PLAYER_LINK_SELECTOR, timeout=20000):
+                    raise RuntimeError("squad list did not load")
+            else:
+                print("⚠️ Squad tab not found, searching for players directly")
+                if not await wait_for_rows_change(page, PLAYER_LINK_SELECTOR, None, timeout=20000):
+                    raise RuntimeError("no player links found")
+            player_links = await page.query_selector_all(PLAYER_LINK_SELECTOR)
+
+            for a in player_links:
+                href = await a.get_attribute("href")
+                if href and "/player/" in href:
+                    parts = href.strip("/").split("/player/")[-1].split("/")
+                    if len(parts) >= 2:
+                        slugs.add(f"{parts[-2]}/{parts[-1]}")
+    except Exception as e:
+        print(f"❌ Could not read team page: {team_url} → {e}")
+        return None
+    return slugs
+
+# 🏆 All player slugs of a tournament, team pages crawled in parallel
+async def get_tournament_slugs(pool, key):
+    try:
+        team_urls = await get_team_urls(pool, TOURNAMENTS[key])
+    except Exception as e:
+        print(f"❌ Could not read teams for {key}: {e}")
+        return None
+    print(f"📌 {key}: {len(team_urls)} teams found")
+    team_slugs = await asyncio.gather(*(get_team_slugs(pool, team_url) for team_url in team_urls))
+    failed = sum(slugs is None for slugs in team_slugs)
+    if failed:
+        # A partial list would report the missing squads as removed players
+        print(f"❌ {key}: {failed}/{len(team_urls)} team pages failed, not updating its slug list")
+        return None
+    return set().union(*team_slugs)
+
+# 📁 Crawl tournaments, update their slug lists and write only the changes
+async def crawl_tournaments(keys, concurrency=DEFAULT_CONCURRENCY, headless=True, router=None):
+    async with BrowserPool(concurrency=concurrency, headless=headless, router=router) as pool:
+        results = await asyncio.gather(*(get_tournament_slugs(pool, key) for key in keys))
+    if router is not None:
+        print(router.summary())
+
+    all_added, all_removed = set(), set()
+    for key, slugs in zip(keys, results):
+        if not slugs:
+            print(f"⚠️ No complete slug list for {key}, keeping the existing list untouched.")
+            continue
+        path = slug_list_path(key)
+        previous = read_slug_file(path)
+        added, removed = slugs - previous, previous - slugs
+        write_slug_file(path, slugs)
+        all_added |= added
+        all_removed |= removed
+        print(f"✅ {key}: {len(slugs)} slugs (+{len(added)} / -{len(removed)}) → {path}")
+
+    # Deltas for the stats scraper: only new players need a scrape
+    write_slug_file(os.path.join(OUTPUT_DIR, "new_slugs.txt"), all_added)
+    write_slug_file(os.path.join(OUTPUT_DIR, "removed_slugs.txt"), all_removed)
+    print(f"\n✅ {len(all_added)} new and {len(all_removed)} removed slugs → {OUTPUT_DIR}/new_slugs.txt, {OUTPUT_DIR}/removed_slugs.txt")
+    return all_added, all_removed
+
+async def get_premier_league_slugs():
+    return await crawl_tournaments(["premier"])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect Sofascore player slugs for one or more tournaments.")
+    parser.add_argument("--tournaments", nargs="+", choices=sorted(TOURNAMENTS), default=["premier"])
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Number of pages crawled at the same time")
+    parser.add_argument("--headed", action="store_true", help="Show the browser windows")
+    add_router_arguments(parser)
+    args = parser.parse_args()
+    asyncio.run(crawl_tournaments(args.tournaments, concurrency=args.concurrency, headless=not args.headed,
+                                  router=router_from_args(args)))
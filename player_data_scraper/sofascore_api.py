@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+import re
+from datetime import datetime, timezone
+import pandas as pd
+import scrape_journal
+
+API_BASE = "https://www.sofascore.com/api/v1"
+
+# 🔧 Sofascore statistics fields behind every TAB_HEADERS column
+STAT_FIELDS = {
+    "MP": "appearances",
+    "DK": "minutesPlayed",
+    "GLS": "goals",
+    "AST": "assists",
+    "ASR": "rating",
+    "TOS": "totalShots",
+    "SOT": "shotsOnTarget",
+    "BCM": "bigChancesMissed",
+    "KEYP": "keyPasses",
+    "BCC": "bigChancesCreated",
+    "SDR": "successfulDribbles",
+    "APS": "accuratePasses",
+    "APS%": "accuratePassesPercentage",
+    "ALB": "accurateLongBalls",
+    "LBA%": "accurateLongBallsPercentage",
+    "ACR": "accurateCrosses",
+    "CA%": "accurateCrossesPercentage",
+    "CLS": "cleanSheet",
+    "YC": "yellowCards",
+    "RC": "redCards",
+    "ELTG": "errorLeadToGoal",
+    "DRP": "dribbledPast",
+    "TACK": "tackles",
+    "INT": "interceptions",
+    "BLS": "blockedShots",
+    "ADW": "aerialDuelsWon",
+    "xG": "expectedGoals",
+    "xA": "expectedAssists",
+    "GI": "goalsAssistsSum",
+}
+
+# Decimal places used by the player page for non-integer columns
+DECIMALS = {"ASR": 2, "APS%": 1, "LBA%": 1, "CA%": 1, "xG": 2, "xA": 2, "XGI": 2}
+
+# API position letters → what the player page shows (K is goalkeeper)
+POSITION_LABELS = {"G": "K", "D": "D", "M": "OS", "F": "F"}
+
+# Tournament categories that the page lists under "International competitions". National team
+# tournaments use the same categories; the page scraper never reads them, so they are dropped too
+INTERNATIONAL_CATEGORIES = {"Europe", "World", "South America", "North & Central America", "Asia", "Africa", "Oceania"}
+
+MAX_PARALLEL_REQUESTS = 8
+
+
+class PageFetcher:
+    """Fetches API JSON through a Playwright page, sharing its cookies and headers."""
+
+    def __init__(self, page):
+        self.page = page
+
+    async def get_json(self, path):
+        response = await self.page.request.get(API_BASE + path, headers={"Referer": "https://www.sofascore.com/"})
+        if response.status == 404:
+            return None
+        if not response.ok:
+            raise RuntimeError(f"API request failed ({response.status}): {path}")
+        return await response.json()
+
+
+class FixtureFetcher:
+    """Replays responses recorded by RecordingFetcher, for offline runs."""
+
+    def __init__(self, fixture_dir):
+        self.fixture_dir = fixture_dir
+
+    async def get_json(self, path):
+        fixture_path = fixture_file(self.fixture_dir, path)
+        if not os.path.exists(fixture_path):
+            return None
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+class RecordingFetcher:
+    """Wraps another fetcher and stores every response as a fixture file."""
+
+    def __init__(self, fetcher, fixture_dir):
+        self.fetcher = fetcher
+        self.fixture_dir = fixture_dir
+
+    async def get_json(self, path):
+        data = await self.fetcher.get_json(path)
+        if data is not None:
+            fixture_path = fixture_file(self.fixture_dir, path)
+            os.makedirs(os.path.dirname(fixture_path), exist_ok=True)
+            with open(fixture_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+        return data
+
+
+def fixture_file(fixture_dir, path):
+    return os.path.join(fixture_dir, path.strip("/").replace("/", "__") + ".json")
+
+
+def format_stat(header, value):
+    if value is None:
+        return None
+    if header in DECIMALS:
+        # The page shows a 0% as "0", not "0.0"
+        if header.endswith("%") and float(value) == 0:
+            return "0"
+        return f"{float(value):.{DECIMALS[header]}f}"
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def stats_to_row(statistics):
+    row = {header: format_stat(header, statistics.get(field)) for header, field in STAT_FIELDS.items()}
+    xg, xa = statistics.get("expectedGoals"), statistics.get("expectedAssists")
+    row["XGI"] = format_stat("XGI", xg + xa) if xg is not None and xa is not None else None
+    return row
+
+
+def season_start_year(season_name):
+    # Same rule as the page scraper: only "24/25" style seasons get an age
+    year_match = re.search(r'(\d{2})/\d{2}', season_name)
+    return 2000 + int(year_match.group(1)) if year_match else None
+
+
+# 🔁 Career rows for one player straight from the JSON API
+async def fetch_player_career(fetcher, slug: str, columns=None) -> pd.DataFrame:
+    player_id = slug.split("/")[-1]
+    player_name = slug.split("/")[0].replace("-", " ").title()
+
+    player_json = await fetcher.get_json(f"/player/{player_id}")
+    if not player_json or "player" not in player_json:
+        print(f"⚠️ Player not found in API ({slug})")
+        return pd.DataFrame(columns=columns)
+    player = player_json["player"]
+
+    player_position = POSITION_LABELS.get(player.get("position"), player.get("position"))
+    if player_position == "K":
+        print(f"❗ Player {player_name} is a goalkeeper, skipping data.")
+        skipped = pd.DataFrame(columns=columns)
+        skipped.attrs["skipped"] = scrape_journal.SKIPPED_GOALKEEPER
+        return skipped
+
+    birth_year = None
+    if player.get("dateOfBirthTimestamp") is not None:
+        birth_year = datetime.fromtimestamp(player["dateOfBirthTimestamp"], tz=timezone.utc).year
+    nationality = (player.get("country") or {}).get("alpha3")
+
+    seasons_json = await fetcher.get_json(f"/player/{player_id}/statistics/seasons") or {}
+    jobs = []
+    for entry in seasons_json.get("uniqueTournamentSeasons", []):
+        tournament = entry["uniqueTournament"]
+        category_name = (tournament.get("category") or {}).get("name")
+        category = "International competitions" if category_name in INTERNATIONAL_CATEGORIES else "Domestic leagues"
+        for season in entry.get("seasons", []):
+            jobs.append((tournament, season, category))
+
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_REQUESTS)
+
+    async def fetch_season(tournament, season, category):
+        async with semaphore:
+            data = await fetcher.get_json(
+                f"/player/{player_id}/unique-tournament/{tournament['id']}/season/{season['id']}/statistics/overall")
+        if not data or "statistics" not in data:
+            return None
+        # National team tournaments share categories with club ones ("Europe", "World")
+        if (data.get("team") or {}).get("national"):
+            return None
+        season_name = season.get("year") or season.get("name")
+        row = {
+            "Player": player_name,
+            "Age": None,
+            "Nationality": nationality,
+            "Position": player_position,
+            "Season": season_name,
+            "League": tournament["name"],
+            "Category": category,
+        }
+        start_year = season_start_year(season_name)
+        if birth_year is not None and start_year is not None:
+            row["Age"] = start_year - birth_year
+        row.update(stats_to_row(data["statistics"]))
+        return row
+
+    rows = await asyncio.gather(*(fetch_season(*job) for job in jobs))
+    df = pd.DataFrame([row for row in rows if row is not None])
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    print(f"✅ API: {len(df)} season rows for {slug}")
+    return df
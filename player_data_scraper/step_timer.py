@@ -0,0 +1,182 @@
+import json
+import os
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, float("inf")]
+
+# Prefix of every metric in the Prometheus text output
+METRIC_PREFIX = "scraper"
+
+
+def prometheus_name(name):
+    return f"{METRIC_PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+
+def prometheus_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class StepTimer:
+    """Collects wall-clock durations per scraping step (goto, tab switch, ...) and event counters.
+
+    Counters are keyed by name and target, e.g. ("timeouts", <selector>) or
+    ("retries", "select league"), so rates can be computed per step.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.samples = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+
+    def record(self, step, seconds):
+        self.samples.setdefault(step, []).append(seconds)
+
+    @contextmanager
+    def measure(self, step):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(step, time.perf_counter() - start)
+
+    def each(self, items, step):
+        """Iterate `items`, recording the time spent on every item under `step` (a name or item → name)."""
+        for item in items:
+            start = time.perf_counter()
+            try:
+                yield item
+            finally:
+                self.record(step(item) if callable(step) else step, time.perf_counter() - start)
+
+    def count(self, name, target="", n=1):
+        key = (name, target)
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def counter(self, name, target=None):
+        """One counter, or the sum over all targets of `name` when no target is given."""
+        if target is not None:
+            return self.counters.get((name, target), 0)
+        return sum(n for (counter_name, _), n in self.counters.items() if counter_name == name)
+
+    def targets(self, name):
+        return {target: n for (counter_name, target), n in self.counters.items() if counter_name == name}
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def per_minute(self, name):
+        return self.counter(name) / max(self.elapsed / 60, 1e-9)
+
+    def retry_rates(self):
+        """Retries / attempts of every step that counts both."""
+        return {target: self.counter("retries", target) / attempts
+                for target, attempts in self.targets("attempts").items() if attempts}
+
+    def histogram(self, step):
+        counts = [0] * len(BUCKETS)
+        for seconds in self.samples.get(step, []):
+            counts[bisect_left(BUCKETS, seconds)] += 1
+        return dict(zip([str(b) for b in BUCKETS], counts))
+
+    def stats(self, step):
+        values = sorted(self.samples.get(step, []))
+        if not values:
+            return None
+        return {
+            "count": len(values),
+            "total": sum(values),
+            "mean": sum(values) / len(values),
+            "p50": values[int(0.50 * (len(values) - 1))],
+            "p95": values[int(0.95 * (len(values) - 1))],
+            "max": values[-1],
+            "histogram": self.histogram(step),
+        }
+
+    def report(self, top=10):
+        # Steps ordered by total time spent, the biggest cost first
+        steps = sorted(self.samples, key=lambda s: -sum(self.samples[s]))
+        print("\n⏱️ Step timings (seconds)")
+        print(f"{'step':<40}{'count':>7}{'total':>10}{'mean':>8}{'p50':>8}{'p95':>8}{'max':>8}")
+        for step in steps:
+            s = self.stats(step)
+            print(f"{step:<40}{s['count']:>7}{s['total']:>10.1f}{s['mean']:>8.2f}{s['p50']:>8.2f}{s['p95']:>8.2f}{s['max']:>8.2f}")
+
+        if not self.counters:
+            return
+        print(f"\n📈 Throughput over {self.elapsed / 60:.1f} min: {self.per_minute('players'):.1f} players/min, "
+              f"{self.per_minute('pages'):.1f} pages/min, {self.counter('rows')} rows")
+        outcomes = self.targets("scrapes")
+        if outcomes:
+            print("   Scrape attempts: " + ", ".join(f"{status} {n}" for status, n in sorted(outcomes.items())))
+        rates = self.retry_rates()
+        if rates:
+            print("\n🔁 Retry rate by step")
+            for target, rate in sorted(rates.items(), key=lambda item: -item[1]):
+                print(f"{target:<40}{self.counter('retries', target):>7} / {self.counter('attempts', target):<7}{rate:>8.1%}")
+        timeouts = sorted(self.targets("timeouts").items(), key=lambda item: -item[1])
+        if timeouts:
+            print(f"\n⌛ Timeouts by selector (top {min(top, len(timeouts))} of {len(timeouts)})")
+            for target, n in timeouts[:top]:
+                print(f"{n:>7}  {target}")
+
+    def snapshot(self):
+        return {
+            "elapsed_seconds": self.elapsed,
+            "steps": {step: self.stats(step) for step in self.samples},
+            "counters": [{"name": name, "target": target, "value": n}
+                         for (name, target), n in sorted(self.counters.items())],
+            "per_minute": {name: self.per_minute(name) for name in ("players", "pages", "rows")},
+            "retry_rates": self.retry_rates(),
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def prometheus(self):
+        """Prometheus text exposition format: step histograms, counters and per-minute rates."""
+        name = prometheus_name("step_seconds")
+        lines = [f"# HELP {name} Wall-clock duration of scraping steps.", f"# TYPE {name} histogram"]
+        for step, values in sorted(self.samples.items()):
+            label = f'step="{prometheus_label(step)}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS, self.histogram(step).values()):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else bound
+                lines.append(f'{name}_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{label}}} {sum(values)}")
+            lines.append(f"{name}_count{{{label}}} {len(values)}")
+
+        for counter_name in sorted({counter_name for counter_name, _ in self.counters}):
+            name = prometheus_name(f"{counter_name}_total")
+            lines.append(f"# TYPE {name} counter")
+            for target, n in sorted(self.targets(counter_name).items()):
+                label = f'{{target="{prometheus_label(target)}"}}' if target else ""
+                lines.append(f"{name}{label} {n}")
+
+        for counter_name in ("players", "pages"):
+            name = prometheus_name(f"{counter_name}_per_minute")
+            lines += [f"# TYPE {name} gauge", f"{name} {self.per_minute(counter_name)}"]
+        name = prometheus_name("uptime_seconds")
+        lines += [f"# TYPE {name} gauge", f"{name} {self.elapsed}"]
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path):
+        """Write the metrics atomically; `.prom` files get the Prometheus text format, others JSON."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        if path.endswith(".prom"):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus())
+        else:
+            self.dump(tmp_path)
+        # A scraper (e.g. node_exporter's textfile collector) never sees a half-written file
+        os.replace(tmp_path, path)
@@ -0,0 +1,103 @@
+import asyncio
+import csv
+import os
+import sys
+import pandas as pd
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+import scrape_journal
+from output_sink import CsvSink
+from scrape_journal import ScrapeJournal
+from scrape_player_stats import OUTPUT_COLUMNS, process_players_from_file
+
+FIXTURE_DIR = os.path.join(SCRAPER_DIR, "tests", "fixtures", "sofascore_api")
+
+
+def read_csv_rows(path):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_pending_skips_finished_slugs(tmp_path):
+    with ScrapeJournal(str(tmp_path / "journal.sqlite")) as journal:
+        journal.record("done/1", scrape_journal.DONE, rows=3)
+        journal.record("keeper/2", scrape_journal.SKIPPED_GOALKEEPER)
+        slugs = ["done/1", "keeper/2", "new/3"]
+        assert journal.pending(slugs) == ["new/3"]
+        assert journal.finished(slugs) == ["done/1", "keeper/2"]
+
+
+def test_pending_retries_failed_slugs(tmp_path):
+    with ScrapeJournal(str(tmp_path / "journal.sqlite")) as journal:
+        journal.record("flaky/1", scrape_journal.FAILED, error="timeout")
+        journal.record("flaky/1", scrape_journal.FAILED, error="timeout")
+        # Without a total cap a failed slug is retried on every resume
+        assert journal.pending(["flaky/1"]) == ["flaky/1"]
+        assert journal.status("flaky/1") == (scrape_journal.FAILED, 2)
+
+
+def test_pending_max_total_attempts(tmp_path):
+    with ScrapeJournal(str(tmp_path / "journal.sqlite")) as journal:
+        journal.record("flaky/1", scrape_journal.FAILED)
+        journal.record("flaky/1", scrape_journal.FAILED)
+        journal.record("once/2", scrape_journal.FAILED)
+        slugs = ["flaky/1", "once/2", "new/3"]
+        assert journal.pending(slugs, max_total_attempts=2) == ["once/2", "new/3"]
+        assert journal.pending(slugs, max_total_attempts=3) == slugs
+        # A slug that finished after failing is never pending again
+        journal.record("once/2", scrape_journal.DONE, rows=1)
+        assert journal.pending(slugs, max_total_attempts=3) == ["flaky/1", "new/3"]
+
+
+def test_csv_sink_append_keeps_single_header(tmp_path):
+    path = str(tmp_path / "out.csv")
+    columns = ["Player", "Age", "Season"]
+    with CsvSink(path, columns) as sink:
+        sink.write_frame(pd.DataFrame([{"Player": "A", "Age": 20, "Season": "24/25"}]))
+    with CsvSink(path, columns, append=True) as sink:
+        sink.write_frame(pd.DataFrame([{"Season": "23/24", "Player": "B"}]))
+    assert read_csv_rows(path) == [columns, ["A", "20", "24/25"], ["B", "", "23/24"]]
+
+
+def test_csv_sink_without_append_starts_over(tmp_path):
+    path = str(tmp_path / "out.csv")
+    with CsvSink(path, ["Player"]) as sink:
+        sink.write_frame(pd.DataFrame([{"Player": "A"}]))
+    with CsvSink(path, ["Player"]) as sink:
+        sink.write_frame(pd.DataFrame([{"Player": "B"}]))
+    assert read_csv_rows(path) == [["Player"], ["B"]]
+
+
+def test_resumed_run_retries_only_unfinished_slugs(tmp_path):
+    slug_file = tmp_path / "slugs.txt"
+    slug_file.write_text("ethan-nwaneri/1153270\ntest-keeper/1090917\nmissing-player/999\n", encoding="utf-8")
+    output = str(tmp_path / "out.csv")
+    journal_path = str(tmp_path / "journal.sqlite")
+
+    def run(**kwargs):
+        asyncio.run(process_players_from_file(str(slug_file), concurrency=1, output_filename=output,
+                                              journal_path=journal_path, max_attempts=1,
+                                              fixtures_dir=FIXTURE_DIR, **kwargs))
+
+    run()
+    rows = read_csv_rows(output)
+    assert rows[0] == OUTPUT_COLUMNS
+    assert len(rows) == 4
+    with ScrapeJournal(journal_path) as journal:
+        assert journal.status("ethan-nwaneri/1153270") == (scrape_journal.DONE, 1)
+        assert journal.status("test-keeper/1090917") == (scrape_journal.SKIPPED_GOALKEEPER, 1)
+        assert journal.status("missing-player/999") == (scrape_journal.FAILED, 1)
+
+    # The resume only retries the failed slug and appends without a second header
+    run(resume=True)
+    assert read_csv_rows(output) == rows
+    with ScrapeJournal(journal_path) as journal:
+        assert journal.status("ethan-nwaneri/1153270") == (scrape_journal.DONE, 1)
+        assert journal.status("missing-player/999") == (scrape_journal.FAILED, 2)
+
+    # With the total cap used up nothing is scraped anymore
+    run(resume=True, max_total_attempts=2)
+    with ScrapeJournal(journal_path) as journal:
+        assert journal.status("missing-player/999") == (scrape_journal.FAILED, 2)